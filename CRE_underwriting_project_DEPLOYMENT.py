@@ -14,14 +14,19 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-import pandas as pd
 import numpy as np
-import numpy_financial as npf
-import plotly.graph_objects as go
 import json
+import bisect
+import hashlib
+import importlib.util
+import io
 import os
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
 
 # ==================== PASSWORD PROTECTION ====================
 def check_password():
@@ -65,33 +70,57 @@ if not check_password():
 
 # ==================== APP CONTINUES BELOW ====================
 
-import pandas as pd
-import numpy as np
-import numpy_financial as npf
-import plotly.graph_objects as go
-import json
-import os
-import time
-import random
+def _heavy_imports():
+    """
+    Deferred imports of the heavy stack (pandas, plotly, the batched
+    finance kernels, reportlab). Called once past the password/intro/
+    matrix gates so those screens paint with just streamlit + numpy; on
+    reruns the modules come straight out of sys.modules.
+    """
+    global pd, go, PDF_AVAILABLE
+
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    global irr_vec, npv_vec
+    from fast_finance import irr_vec, npv_vec
+
+    # Only probe for reportlab here; the actual import waits for the first
+    # PDF build so sessions that never export skip its load cost entirely
+    PDF_AVAILABLE = importlib.util.find_spec('reportlab') is not None
+
+
+def _import_reportlab():
+    """PDF generation imports, deferred to the first report build"""
+    global letter, inch, colors, getSampleStyleSheet, ParagraphStyle
+    global SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+    global RLImage, HRFlowable, TA_CENTER, ImageReader
 
-# PDF Generation imports
-try:
     from reportlab.lib.pagesizes import letter
     from reportlab.lib.units import inch
     from reportlab.lib import colors
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+    from reportlab.platypus import Image as RLImage
     from reportlab.platypus.flowables import HRFlowable
     from reportlab.lib.enums import TA_CENTER
-    from datetime import datetime
-    import io
-    import tempfile
-    PDF_AVAILABLE = True
+    from reportlab.lib.utils import ImageReader
+
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    PDF_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 
-DEALS_FILE = "saved_deals.json"
+# Saved-deal fields that are derived metadata, not input widget values
+_DEAL_METADATA_KEYS = frozenset({'saved_date', 'irr', 'equity_multiple', 'npv',
+                                 'going_in_cap', 'unit_rents'})
+
+DEALS_FILE = "saved_deals.json"  # legacy full-dict store, migrated on first load
+DEALS_LOG = "deals.jsonl"        # append-only op log ({name, op, data} per line)
+_IO_BUF = 1 << 16                # 64 KB buffer for store reads/writes
 
 # ==================== PDF THEME CONFIGURATIONS ====================
 PDF_THEMES = {
@@ -138,58 +167,306 @@ PDF_THEMES = {
 
 
 # ==================== CHART CAPTURE HELPER ====================
-def save_chart_to_session(chart_name, fig):
-    """Save plotly figure to session state for PDF inclusion"""
+_KALEIDO_SERVER_STARTED = False
+
+
+def _ensure_kaleido_server():
+    """
+    Start a persistent Kaleido render server once per process (kaleido 1.x).
+    kaleido 0.2.x (the pinned version) already keeps one long-lived scope
+    inside plotly.io, so this is a no-op there; on 1.x it avoids paying the
+    multi-second engine spin-up for every chart in a PDF.
+    """
+    global _KALEIDO_SERVER_STARTED
+    if _KALEIDO_SERVER_STARTED:
+        return
     try:
-        # Try to convert to image bytes using kaleido
-        img_bytes = fig.to_image(format="png", width=1200, height=700, scale=2)
-        st.session_state.charts[chart_name] = img_bytes
-    except:
+        import kaleido
+        if hasattr(kaleido, 'start_sync_server'):
+            kaleido.start_sync_server()
+    except Exception:
+        pass
+    _KALEIDO_SERVER_STARTED = True
+
+
+# Charts embed at 6.5in x 3.8in; 1300x760 is 2x that for crisp zoom while
+# rendering ~7x fewer pixels than the old 2400x1400
+_CHART_PNG_W = 1300
+_CHART_PNG_H = 760
+
+
+def _to_image_png(fig):
+    """Render via kaleido's direct bytes path"""
+    return fig.to_image(format="png", width=_CHART_PNG_W, height=_CHART_PNG_H, scale=1)
+
+
+# Renderers probed in order; once one works it's remembered so later
+# charts skip the exception-driven fallback walk entirely
+_CHART_RENDERERS = (_to_image_png,)
+_CHART_ENGINE = None
+
+# At PDF render size most points beyond this fall within a single pixel
+_MAX_TRACE_POINTS = 2000
+
+
+def _downsample_traces(fig):
+    """Cap each trace at _MAX_TRACE_POINTS via stride sampling; invisible at PDF resolution"""
+    for trace in fig.data:
+        y = getattr(trace, 'y', None)
+        if y is None or len(y) <= _MAX_TRACE_POINTS:
+            continue
+        idx = np.linspace(0, len(y) - 1, _MAX_TRACE_POINTS).astype(int)
+        x = getattr(trace, 'x', None)
+        if x is not None and len(x) == len(y):
+            trace.x = np.asarray(x)[idx]
+        trace.y = np.asarray(y)[idx]
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _rasterize_chart(fig_json):
+    """Render a plotly figure (passed as JSON) to PNG bytes, or None if no renderer works"""
+    global _CHART_ENGINE
+    _ensure_kaleido_server()
+    fig = _downsample_traces(go.Figure(json.loads(fig_json)))
+    if _CHART_ENGINE is not None:
+        try:
+            return _CHART_ENGINE(fig)
+        except:
+            pass
+    for render in _CHART_RENDERERS:
         try:
-            # Fallback: use plotly's write_image with orca
-            import io as io_module
-            img_buffer = io_module.BytesIO()
-            fig.write_image(img_buffer, format='png', width=1200, height=700)
-            img_buffer.seek(0)
-            st.session_state.charts[chart_name] = img_buffer.read()
+            png = render(fig)
+            _CHART_ENGINE = render
+            return png
         except:
-            # Final fallback: save figure object and try to convert in PDF
-            st.session_state.charts[chart_name] = fig
+            continue
+    return None
+
+
+def _render_to_png(chart_data):
+    """Normalize one chart entry to PNG bytes: pass bytes through, render figures."""
+    if isinstance(chart_data, bytes):
+        return chart_data
+    try:
+        return _rasterize_chart(chart_data.to_json())
+    except Exception:
+        return None
+
+
+def save_chart_to_session(chart_name, fig):
+    """
+    Save plotly figure to session state as PNG bytes for PDF inclusion.
+    Rasterization is cached on the figure's JSON, so unchanged charts are
+    not re-rendered across reruns. Charts that can't render are skipped so
+    the PDF build only ever sees ready-to-embed bytes.
+    """
+    img_bytes = _rasterize_chart(fig.to_json())
+    if img_bytes is not None:
+        st.session_state.charts[chart_name] = img_bytes
+
+
+# Figure construction is pure-Python trace/layout validation and dominates
+# rerun time for small charts; memoize the builders on the underlying
+# arrays so unchanged numbers reuse the same Figure object
+_FIG_HASH_FUNCS = {np.ndarray: lambda a: hashlib.blake2b(a.tobytes()).digest()}
+
+@st.cache_resource(show_spinner=False, max_entries=16, hash_funcs=_FIG_HASH_FUNCS)
+def _loan_balance_fig(years, balance, holding_period):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=balance,
+        mode='lines',
+        name='Loan Balance',
+        line=dict(color='#1f77b4', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(31, 119, 180, 0.2)'
+    ))
+    fig.add_vline(
+        x=holding_period,
+        line_dash="dash",
+        line_color="red",
+        line_width=2,
+        annotation_text=f"Holding Period: {holding_period} years",
+        annotation_position="top"
+    )
+    fig.update_layout(
+        title='Loan Balance Over Time',
+        xaxis_title='Year',
+        yaxis_title='Remaining Balance ($)',
+        height=400,
+        showlegend=False,
+        hovermode='x unified'
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=16, hash_funcs=_FIG_HASH_FUNCS)
+def _noi_fig(years, noi):
+    fig = go.Figure(go.Bar(x=years, y=noi, marker_color='#1f77b4'))
+    fig.update_layout(title='NOI Growth Over Time', xaxis_title='Year', yaxis_title='NOI ($)', height=400, showlegend=False)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=16, hash_funcs=_FIG_HASH_FUNCS)
+def _cf_fig(years, cash_flow, title_text):
+    fig = go.Figure(go.Scatter(x=years, y=cash_flow, mode='lines+markers',
+                               line=dict(color='#2ca02c', width=3), marker=dict(size=8)))
+    fig.update_layout(title=title_text, xaxis_title='Year', yaxis_title='Cash Flow ($)', height=400, showlegend=False)
+    return fig
 
 
 # ==================== PDF GENERATION FUNCTIONS ====================
+@st.cache_resource(show_spinner=False)
+def _pdf_pool():
+    """Shared worker pool for background PDF builds (survives reruns)"""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def _pdf_content_digest(property_data, cash_flow_df, theme_key, charts_dict, loan_schedule_df):
+    """Stable content hash of everything that influences the rendered PDF"""
+    h = hashlib.blake2b()
+    h.update(json.dumps(property_data, sort_keys=True, default=str).encode())
+    h.update(cash_flow_df.to_numpy().tobytes())
+    h.update(theme_key.encode())
+    for chart_name, chart_data in (charts_dict or {}).items():
+        h.update(chart_name.encode())
+        if isinstance(chart_data, bytes):
+            h.update(chart_data)
+        else:
+            h.update(chart_data.to_json().encode())
+    if loan_schedule_df is not None:
+        h.update(loan_schedule_df.to_numpy().tobytes())
+    return h.hexdigest()
+
+
 def generate_pdf_report(property_data, cash_flow_df, theme_key="professional_blue", charts_dict=None, loan_schedule_df=None):
-    """Generate professional PDF investment memo"""
-    
+    """
+    Generate professional PDF investment memo (cached).
+    Identical re-requests (same inputs, same theme, same charts) return the
+    previously rendered bytes instead of re-running the whole reportlab +
+    chart pipeline.
+    """
     if not PDF_AVAILABLE:
         return None
-    
-    # Track temp files for cleanup after PDF is built
-    temp_files_to_cleanup = []
-    
-    # Get theme colors
+    _import_reportlab()
+
+    digest = _pdf_content_digest(property_data, cash_flow_df, theme_key, charts_dict, loan_schedule_df)
+    return _generate_pdf_cached(digest, property_data, cash_flow_df, theme_key, charts_dict, loan_schedule_df)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _generate_pdf_cached(content_digest, _property_data, _cash_flow_df, theme_key, _charts_dict, _loan_schedule_df):
+    """Cached PDF build keyed on the content digest (underscore args aren't hashed)"""
+    buffer = _build_pdf_report(_property_data, _cash_flow_df, theme_key, _charts_dict, _loan_schedule_df)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=64)
+def _hex(hex_str):
+    """Parse a hex color string into a reportlab Color once"""
+    return colors.HexColor(hex_str)
+
+
+@lru_cache(maxsize=8)
+def _theme_styles(theme_key):
+    """Build the reportlab styles for one theme once; reused across memo builds"""
     theme = PDF_THEMES.get(theme_key, PDF_THEMES["professional_blue"])
-    primary_color = colors.HexColor(theme["primary"])
-    secondary_color = colors.HexColor(theme["secondary"])
-    accent_color = colors.HexColor(theme["accent"])
-    
+    primary_color = _hex(theme["primary"])
+    secondary_color = _hex(theme["secondary"])
+    accent_color = _hex(theme["accent"])
+
+    styles = getSampleStyleSheet()
+    return {
+        'primary': primary_color,
+        'secondary': secondary_color,
+        'accent': accent_color,
+        'styles': styles,
+        'title': ParagraphStyle('CustomTitle', parent=styles['Heading1'],
+                                fontSize=24, textColor=primary_color,
+                                spaceAfter=30, alignment=TA_CENTER),
+        'heading': ParagraphStyle('CustomHeading', parent=styles['Heading2'],
+                                  fontSize=16, textColor=primary_color,
+                                  spaceAfter=12, spaceBefore=12),
+        'metrics_table': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+        ]),
+        'returns_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), primary_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ]),
+        'inv_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), primary_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('BACKGROUND', (0, 5), (-1, 5), primary_color),
+            ('TEXTCOLOR', (0, 5), (-1, 5), colors.whitesmoke),
+            ('BACKGROUND', (0, 10), (-1, 10), primary_color),
+            ('TEXTCOLOR', (0, 10), (-1, 10), colors.whitesmoke),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ]),
+        'cf_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), primary_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ]),
+        'assump_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), primary_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('BACKGROUND', (0, 6), (-1, 6), primary_color),
+            ('TEXTCOLOR', (0, 6), (-1, 6), colors.whitesmoke),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ]),
+    }
+
+
+@lru_cache(maxsize=64)
+def _image_reader(png_bytes):
+    """Decode chart PNG bytes once; repeat memo builds reuse the same reader"""
+    reader = ImageReader(io.BytesIO(png_bytes))
+    # Expose a read() so platypus Image treats the reader as file-like; its
+    # internal ImageReader(reader) call then borg-copies instead of re-decoding
+    reader.read = reader.fp.read
+    return reader
+
+
+def _build_pdf_report(property_data, cash_flow_df, theme_key, charts_dict, loan_schedule_df):
+    """Build the PDF investment memo and return the filled BytesIO buffer"""
+
+    # Theme styles are precompiled once per theme
+    ts = _theme_styles(theme_key)
+    primary_color = ts['primary']
+    styles = ts['styles']
+    title_style = ts['title']
+    heading_style = ts['heading']
+
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, 
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
                            rightMargin=0.5*inch, leftMargin=0.5*inch,
                            topMargin=0.75*inch, bottomMargin=0.75*inch)
-    
+
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'],
-                                fontSize=24, textColor=primary_color,
-                                spaceAfter=30, alignment=TA_CENTER)
-    
-    heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'],
-                                  fontSize=16, textColor=primary_color,
-                                  spaceAfter=12, spaceBefore=12)
-    
+
     # Title Page
     story.append(Spacer(1, 1.5*inch))
     story.append(Paragraph("COMMERCIAL REAL ESTATE", title_style))
@@ -207,13 +484,7 @@ def generate_pdf_report(property_data, cash_flow_df, theme_key="professional_blu
         ['NPV', f"${property_data['npv']:,.0f}"]
     ]
     metrics_table = Table(metrics_data, colWidths=[2.5*inch, 2.5*inch])
-    metrics_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-    ]))
+    metrics_table.setStyle(ts['metrics_table'])
     story.append(metrics_table)
     story.append(Spacer(1, 1*inch))
     story.append(Paragraph(f"<i>Generated: {datetime.now().strftime('%B %d, %Y')}</i>", styles['Normal']))
@@ -247,16 +518,7 @@ def generate_pdf_report(property_data, cash_flow_df, theme_key="professional_blu
     ]
     
     returns_table = Table(returns_data, colWidths=[2*inch, 1.5*inch, 3*inch])
-    returns_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), primary_color),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
+    returns_table.setStyle(ts['returns_table'])
     story.append(returns_table)
     story.append(PageBreak())
     
@@ -282,19 +544,7 @@ def generate_pdf_report(property_data, cash_flow_df, theme_key="professional_blu
     ]
     
     inv_table = Table(inv_data, colWidths=[3*inch, 2*inch])
-    inv_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), primary_color),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('BACKGROUND', (0, 5), (-1, 5), primary_color),
-        ('TEXTCOLOR', (0, 5), (-1, 5), colors.whitesmoke),
-        ('BACKGROUND', (0, 10), (-1, 10), primary_color),
-        ('TEXTCOLOR', (0, 10), (-1, 10), colors.whitesmoke),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
+    inv_table.setStyle(ts['inv_table'])
     story.append(inv_table)
     story.append(PageBreak())
     
@@ -304,26 +554,18 @@ def generate_pdf_report(property_data, cash_flow_df, theme_key="professional_blu
     story.append(Spacer(1, 0.2*inch))
     
     cf_data = [['Year', 'NOI', 'CapEx', 'Debt Service', 'BTCF', 'CoC %']]
-    for _, row in cash_flow_df.iterrows():
-        cf_data.append([
-            str(int(row['Year'])),
-            f"${row['NOI']:,.0f}",
-            f"${row['CapEx']:,.0f}",
-            f"${row['Debt Service']:,.0f}",
-            f"${row['BTCF']:,.0f}",
-            f"{row['CoC Return %']:.1f}%"
-        ])
+    cf_arr = cash_flow_df[['Year', 'NOI', 'CapEx', 'Debt Service', 'BTCF', 'CoC Return %']].to_numpy()
+    cf_data.extend([
+        str(int(r[0])),
+        f"${r[1]:,.0f}",
+        f"${r[2]:,.0f}",
+        f"${r[3]:,.0f}",
+        f"${r[4]:,.0f}",
+        f"{r[5]:.1f}%"
+    ] for r in cf_arr)
     
     cf_table = Table(cf_data, colWidths=[0.5*inch, 1.1*inch, 0.9*inch, 1.1*inch, 1.1*inch, 0.8*inch])
-    cf_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), primary_color),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
+    cf_table.setStyle(ts['cf_table'])
     story.append(cf_table)
     story.append(PageBreak())
     
@@ -334,74 +576,30 @@ def generate_pdf_report(property_data, cash_flow_df, theme_key="professional_blu
         story.append(Paragraph("VISUALIZATIONS", heading_style))
         story.append(HRFlowable(width="100%", thickness=2, color=primary_color))
         story.append(Spacer(1, 0.2*inch))
-        
+
+        # Rasterize any not-yet-rendered charts in parallel before the story
+        # loop; each render is an independent I/O-bound Kaleido call
+        with ThreadPoolExecutor(max_workers=min(4, len(charts_dict))) as ex:
+            futures = {name: ex.submit(_render_to_png, chart)
+                       for name, chart in charts_dict.items()}
+            png_map = {name: fut.result() for name, fut in futures.items()}
+
         for chart_name, chart_data in charts_dict.items():
             try:
-                # Create temp file for image
-                import tempfile
-                tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-                tmp_path = tmp.name
-                
-                if isinstance(chart_data, bytes):
-                    tmp.write(chart_data)
-                    tmp.close()
-                    temp_files_to_cleanup.append(tmp_path)
-                    
-                    # Add to PDF
-                    from reportlab.platypus import Image as RLImage
-                    img = RLImage(tmp_path, width=6.5*inch, height=3.8*inch)
-                    story.append(Paragraph(f"<b>{chart_name}</b>", styles['Normal']))
-                    story.append(Spacer(1, 0.1*inch))
-                    story.append(img)
-                    story.append(Spacer(1, 0.3*inch))
-                else:
-                    # Try multiple methods to convert plotly figure
-                    img_bytes = None
-                    
-                    # Method 1: Try kaleido with explicit engine
-                    try:
-                        import kaleido
-                        img_bytes = chart_data.to_image(format="png", width=1200, height=700, scale=2, engine="kaleido")
-                    except Exception as e1:
-                        # Method 2: Try without engine specification
-                        try:
-                            img_bytes = chart_data.to_image(format="png", width=1200, height=700, scale=2)
-                        except Exception as e2:
-                            # Method 3: Try write_image
-                            try:
-                                import io as io_module
-                                img_buffer = io_module.BytesIO()
-                                chart_data.write_image(img_buffer, format='png', width=1200, height=700, engine="kaleido")
-                                img_bytes = img_buffer.getvalue()
-                            except Exception as e3:
-                                # Method 4: Try with orca (legacy)
-                                try:
-                                    img_bytes = chart_data.to_image(format="png", width=1200, height=700, scale=2, engine="orca")
-                                except Exception as e4:
-                                    # All methods failed - skip this chart
-                                    story.append(Paragraph(f"<i>Chart: {chart_name} (unable to embed - chart rendering not available in this environment)</i>", styles['Normal']))
-                                    story.append(Spacer(1, 0.2*inch))
-                                    tmp.close()
-                                    import os
-                                    try:
-                                        os.unlink(tmp_path)
-                                    except:
-                                        pass
-                                    continue
-                    
-                    # If we got image bytes, save and embed
-                    if img_bytes:
-                        tmp.write(img_bytes)
-                        tmp.close()
-                        temp_files_to_cleanup.append(tmp_path)
-                        
-                        from reportlab.platypus import Image as RLImage
-                        img = RLImage(tmp_path, width=6.5*inch, height=3.8*inch)
-                        story.append(Paragraph(f"<b>{chart_name}</b>", styles['Normal']))
-                        story.append(Spacer(1, 0.1*inch))
-                        story.append(img)
-                        story.append(Spacer(1, 0.3*inch))
-                        
+                chart_data = png_map.get(chart_name)
+                if not isinstance(chart_data, bytes):
+                    story.append(Paragraph(f"<i>Chart: {chart_name} (unable to embed - chart rendering not available in this environment)</i>", styles['Normal']))
+                    story.append(Spacer(1, 0.2*inch))
+                    continue
+
+                # Add to PDF straight from memory - no temp file round-trip;
+                # the cached reader also skips re-decoding across memo builds
+                img = RLImage(_image_reader(chart_data), width=6.5*inch, height=3.8*inch)
+                story.append(Paragraph(f"<b>{chart_name}</b>", styles['Normal']))
+                story.append(Spacer(1, 0.1*inch))
+                story.append(img)
+                story.append(Spacer(1, 0.3*inch))
+
             except Exception as e:
                 story.append(Paragraph(f"<i>Chart: {chart_name} (unable to embed - {str(e)[:50]})</i>", styles['Normal']))
                 story.append(Spacer(1, 0.2*inch))
@@ -427,17 +625,7 @@ def generate_pdf_report(property_data, cash_flow_df, theme_key="professional_blu
     ]
     
     assump_table = Table(assump_data, colWidths=[3.5*inch, 2*inch])
-    assump_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), primary_color),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('BACKGROUND', (0, 6), (-1, 6), primary_color),
-        ('TEXTCOLOR', (0, 6), (-1, 6), colors.whitesmoke),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
+    assump_table.setStyle(ts['assump_table'])
     story.append(assump_table)
     story.append(Spacer(1, 0.3*inch))
     
@@ -451,165 +639,152 @@ def generate_pdf_report(property_data, cash_flow_df, theme_key="professional_blu
     # Build PDF
     doc.build(story)
     buffer.seek(0)
-    
-    # Clean up all temp files after PDF is successfully built
-    import os
-    for tmp_path in temp_files_to_cleanup:
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
-    
+
     return buffer
 
 
 # ==================== DEAL SCORING & RECOMMENDATION SYSTEM ====================
 
+# Score lookup tables - replaces the old if/elif ladders with a branchless
+# np.searchsorted bucket lookup (matters when scoring many deals in a loop).
+# "_GE" tables score "value >= threshold" ladders (side='right'),
+# "_LE" tables score "value <= threshold" ladders (side='left').
+IRR_THRESH = np.array([8, 10, 12, 15, 17, 20])
+IRR_SCORE = np.array([2, 6, 10, 13, 16, 18, 20])
+
+EM_THRESH = np.array([1.5, 2.0, 2.5, 3.0, 3.5])
+EM_SCORE = np.array([2, 4, 6, 8, 9, 10])
+
+NPV_PCT_THRESH = np.array([0, 5, 10, 15, 20, 25])
+NPV_PCT_SCORE = np.array([0, 5, 8, 12, 15, 18, 20])
+
+COC1_THRESH = np.array([2, 4, 6, 8, 10])
+COC1_SCORE = np.array([1, 3, 5, 8, 10, 12])
+
+COC_AVG_THRESH = np.array([6, 8, 10, 12])
+COC_AVG_SCORE = np.array([1, 3, 5, 7, 8])
+
+CAP_SPREAD_THRESH = np.array([-0.5, 0, 0.5, 1.0, 1.5])
+CAP_SPREAD_SCORE = np.array([0, 2, 4, 6, 8, 10])
+
+LTV_THRESH_LE = np.array([65, 75, 80])
+LTV_SCORE_LE = np.array([5, 4, 3, 1])
+
+DSCR_THRESH = np.array([1.1, 1.2, 1.3, 1.5])
+DSCR_SCORE = np.array([0, 2, 3, 4, 5])
+
+HOLD_THRESH_LE = np.array([5, 10, 20, 30])
+HOLD_SCORE_LE = np.array([5, 4, 3, 2, 1])
+
+GRADE_THRESH = np.array([55, 60, 65, 70, 75, 80, 85, 90, 95])
+GRADE_LABELS = [('F', 'Poor'), ('C-', 'Weak'), ('C', 'Below Average'),
+                ('C+', 'Average'), ('B-', 'Above Average'), ('B', 'Good'),
+                ('B+', 'Very Good'), ('A-', 'Excellent'), ('A', 'Outstanding'),
+                ('A+', 'Elite')]
+GRADE_ARR = np.array([g for g, _ in GRADE_LABELS])
+RATING_ARR = np.array([r for _, r in GRADE_LABELS])
+
+MARKET_CAPS = {'Multifamily': 5.5, 'Office': 7.0, 'Retail': 6.5, 'Single Family': 6.0}
+
+# (category label, max points) in display order
+SCORE_CATEGORIES = [('Returns (IRR/EM)', 30), ('Value Creation (NPV)', 20),
+                    ('Cash Flow Strength', 20), ('Market Positioning', 15),
+                    ('Risk Profile', 15)]
+
+# Recommendation ladders, indexed by bisect over the score thresholds
+RECOMMEND_THRESH = [55, 65, 75, 85]
+RECOMMEND_TABLE = [
+    ('🔴 HARD PASS', 'This deal has critical red flags. Do not proceed.'),
+    ('🟠 PASS', 'Below-average deal with significant concerns. Not recommended.'),
+    ('🟡 HOLD', 'Average deal with mixed qualities. Consider waiting for better opportunities.'),
+    ('🟢 BUY', 'Solid investment opportunity that meets investment criteria. Proceed if available.'),
+    ('🟢 STRONG BUY', 'This deal offers exceptional risk-adjusted returns. Proceed with acquisition immediately.'),
+]
+CONFIDENCE_THRESH = [70, 85]
+CONFIDENCE_TABLE = ['LOW', 'MODERATE', 'HIGH']
+
+
+def calculate_deal_score_batch(metrics, property_data):
+    """
+    Vectorized deal scoring across N deals with pure NumPy (no per-row Python).
+    metrics / property_data: DataFrames or dicts of equal-length arrays using
+    the same keys as calculate_deal_score.
+    Returns: (total_scores, category_scores, grades, ratings) where
+    category_scores is a dict of {category_label: int array}.
+    """
+    irr = np.atleast_1d(np.asarray(metrics.get('irr', 0), dtype=np.float64))
+    n = irr.shape[0]
+
+    def col(source, key, default):
+        v = source.get(key, default) if hasattr(source, 'get') else default
+        arr = np.asarray(v, dtype=np.float64)
+        return np.broadcast_to(arr, (n,)) if arr.ndim == 0 else arr
+
+    em = col(metrics, 'equity_multiple', 1)
+    npv = col(metrics, 'npv', 0)
+    year1_coc = col(metrics, 'year1_coc', 0)
+    avg_coc = col(metrics, 'avg_coc', 0)
+    going_in_cap = col(metrics, 'cap_rate', 0)
+    dscr = col(metrics, 'dscr', 0)
+
+    equity = col(property_data, 'equity_required', 1)
+    exit_cap = col(property_data, 'exit_cap_rate', 0)
+    ltv = col(property_data, 'loan_to_value', 0)
+    holding_period = col(property_data, 'holding_period', 10)
+    ptype = np.asarray(property_data.get('property_type', ''), dtype=object)
+    ptype = np.broadcast_to(ptype, (n,)) if ptype.ndim == 0 else ptype
+
+    # CATEGORY 1: RETURN METRICS (30 points max)
+    returns_score = (IRR_SCORE[np.searchsorted(IRR_THRESH, irr, side='right')] +
+                     EM_SCORE[np.searchsorted(EM_THRESH, em, side='right')])
+
+    # CATEGORY 2: VALUE CREATION (20 points max)
+    npv_pct = np.where(equity > 0, npv / np.where(equity > 0, equity, 1) * 100, 0)
+    value_score = NPV_PCT_SCORE[np.searchsorted(NPV_PCT_THRESH, npv_pct, side='right')]
+
+    # CATEGORY 3: CASH FLOW STRENGTH (20 points max)
+    cashflow_score = (COC1_SCORE[np.searchsorted(COC1_THRESH, year1_coc, side='right')] +
+                      COC_AVG_SCORE[np.searchsorted(COC_AVG_THRESH, avg_coc, side='right')])
+
+    # CATEGORY 4: MARKET POSITIONING (15 points max)
+    cap_spread = exit_cap - going_in_cap
+    cap_score = CAP_SPREAD_SCORE[np.searchsorted(CAP_SPREAD_THRESH, cap_spread, side='right')]
+    market_cap = np.array([MARKET_CAPS.get(t, 6.5) for t in ptype])
+    entry_score = np.where(going_in_cap >= market_cap + 1, 5,
+                           np.where(going_in_cap >= market_cap, 3, 1))
+    market_score = cap_score + entry_score
+
+    # CATEGORY 5: RISK FACTORS (15 points max)
+    all_cash = ltv == 0
+    ltv_score = np.where(all_cash, 5,
+                         LTV_SCORE_LE[np.searchsorted(LTV_THRESH_LE, ltv, side='left')])
+    dscr_score = np.where(all_cash, 5,
+                          DSCR_SCORE[np.searchsorted(DSCR_THRESH, dscr, side='right')])
+    hold_score = HOLD_SCORE_LE[np.searchsorted(HOLD_THRESH_LE, holding_period, side='left')]
+    risk_score = ltv_score + dscr_score + hold_score
+
+    total_scores = returns_score + value_score + cashflow_score + market_score + risk_score
+
+    grade_idx = np.searchsorted(GRADE_THRESH, total_scores, side='right')
+    category_scores = dict(zip([c for c, _ in SCORE_CATEGORIES],
+                               [returns_score, value_score, cashflow_score,
+                                market_score, risk_score]))
+    return total_scores, category_scores, GRADE_ARR[grade_idx], RATING_ARR[grade_idx]
+
+
 def calculate_deal_score(metrics, property_data):
     """
     Calculate comprehensive deal score (0-100) based on 5 categories
+    Thin wrapper around calculate_deal_score_batch for a single deal
     Returns: (total_score, breakdown_dict, grade, rating)
     """
     try:
-        score_breakdown = {}
-        total_score = 0
-        
-        # CATEGORY 1: RETURN METRICS (30 points max)
-        irr_score = 0
-        irr = metrics.get('irr', 0)
-        if irr >= 20:    irr_score = 20
-        elif irr >= 17:  irr_score = 18
-        elif irr >= 15:  irr_score = 16
-        elif irr >= 12:  irr_score = 13
-        elif irr >= 10:  irr_score = 10
-        elif irr >= 8:   irr_score = 6
-        else:            irr_score = 2
-        
-        em_score = 0
-        em = metrics.get('equity_multiple', 1)
-        if em >= 3.5:    em_score = 10
-        elif em >= 3.0:  em_score = 9
-        elif em >= 2.5:  em_score = 8
-        elif em >= 2.0:  em_score = 6
-        elif em >= 1.5:  em_score = 4
-        else:            em_score = 2
-        
-        returns_score = irr_score + em_score
-        score_breakdown['Returns (IRR/EM)'] = {'score': returns_score, 'max': 30}
-        total_score += returns_score
-        
-        # CATEGORY 2: VALUE CREATION (20 points max)
-        value_score = 0
-        npv = metrics.get('npv', 0)
-        equity = property_data.get('equity_required', 1)
-        npv_pct = (npv / equity) * 100 if equity > 0 else 0
-        
-        if npv_pct >= 25:    value_score = 20
-        elif npv_pct >= 20:  value_score = 18
-        elif npv_pct >= 15:  value_score = 15
-        elif npv_pct >= 10:  value_score = 12
-        elif npv_pct >= 5:   value_score = 8
-        elif npv_pct >= 0:   value_score = 5
-        else:                value_score = 0
-        
-        score_breakdown['Value Creation (NPV)'] = {'score': value_score, 'max': 20}
-        total_score += value_score
-        
-        # CATEGORY 3: CASH FLOW STRENGTH (20 points max)
-        year1_coc = metrics.get('year1_coc', 0)
-        coc1_score = 0
-        if year1_coc >= 10:   coc1_score = 12
-        elif year1_coc >= 8:  coc1_score = 10
-        elif year1_coc >= 6:  coc1_score = 8
-        elif year1_coc >= 4:  coc1_score = 5
-        elif year1_coc >= 2:  coc1_score = 3
-        else:                 coc1_score = 1
-        
-        avg_coc = metrics.get('avg_coc', 0)
-        coc_avg_score = 0
-        if avg_coc >= 12:     coc_avg_score = 8
-        elif avg_coc >= 10:   coc_avg_score = 7
-        elif avg_coc >= 8:    coc_avg_score = 5
-        elif avg_coc >= 6:    coc_avg_score = 3
-        else:                 coc_avg_score = 1
-        
-        cashflow_score = coc1_score + coc_avg_score
-        score_breakdown['Cash Flow Strength'] = {'score': cashflow_score, 'max': 20}
-        total_score += cashflow_score
-        
-        # CATEGORY 4: MARKET POSITIONING (15 points max)
-        going_in_cap = metrics.get('cap_rate', 0)
-        exit_cap = property_data.get('exit_cap_rate', 0)
-        cap_spread = exit_cap - going_in_cap
-        
-        cap_score = 0
-        if cap_spread >= 1.5:     cap_score = 10
-        elif cap_spread >= 1.0:   cap_score = 8
-        elif cap_spread >= 0.5:   cap_score = 6
-        elif cap_spread >= 0:     cap_score = 4
-        elif cap_spread >= -0.5:  cap_score = 2
-        else:                     cap_score = 0
-        
-        # Entry valuation vs market
-        property_type = property_data.get('property_type', '')
-        market_caps = {'Multifamily': 5.5, 'Office': 7.0, 'Retail': 6.5, 'Single Family': 6.0}
-        market_cap = market_caps.get(property_type, 6.5)
-        
-        entry_score = 0
-        if going_in_cap >= market_cap + 1:    entry_score = 5  # Buying cheap
-        elif going_in_cap >= market_cap:      entry_score = 3  # Fair
-        else:                                  entry_score = 1  # Premium
-        
-        market_score = cap_score + entry_score
-        score_breakdown['Market Positioning'] = {'score': market_score, 'max': 15}
-        total_score += market_score
-        
-        # CATEGORY 5: RISK FACTORS (15 points max)
-        ltv = property_data.get('loan_to_value', 0)
-        ltv_score = 0
-        if ltv == 0:          ltv_score = 5  # All cash
-        elif ltv <= 65:       ltv_score = 5
-        elif ltv <= 75:       ltv_score = 4
-        elif ltv <= 80:       ltv_score = 3
-        else:                 ltv_score = 1
-        
-        dscr_score = 0
-        if ltv == 0:
-            dscr_score = 5  # All cash, no debt service
-        else:
-            dscr = metrics.get('dscr', 0)
-            if dscr >= 1.5:    dscr_score = 5
-            elif dscr >= 1.3:  dscr_score = 4
-            elif dscr >= 1.2:  dscr_score = 3
-            elif dscr >= 1.1:  dscr_score = 2
-            else:              dscr_score = 0
-        
-        holding_period = property_data.get('holding_period', 10)
-        hold_score = 0
-        if holding_period <= 5:      hold_score = 5
-        elif holding_period <= 10:   hold_score = 4
-        elif holding_period <= 20:   hold_score = 3
-        elif holding_period <= 30:   hold_score = 2
-        else:                         hold_score = 1
-        
-        risk_score = ltv_score + dscr_score + hold_score
-        score_breakdown['Risk Profile'] = {'score': risk_score, 'max': 15}
-        total_score += risk_score
-        
-        # Calculate grade
-        if total_score >= 95:     grade, rating = 'A+', 'Elite'
-        elif total_score >= 90:   grade, rating = 'A', 'Outstanding'
-        elif total_score >= 85:   grade, rating = 'A-', 'Excellent'
-        elif total_score >= 80:   grade, rating = 'B+', 'Very Good'
-        elif total_score >= 75:   grade, rating = 'B', 'Good'
-        elif total_score >= 70:   grade, rating = 'B-', 'Above Average'
-        elif total_score >= 65:   grade, rating = 'C+', 'Average'
-        elif total_score >= 60:   grade, rating = 'C', 'Below Average'
-        elif total_score >= 55:   grade, rating = 'C-', 'Weak'
-        else:                      grade, rating = 'F', 'Poor'
-        
-        return total_score, score_breakdown, grade, rating
-        
+        totals, category_scores, grades, ratings = calculate_deal_score_batch(
+            metrics, property_data)
+        score_breakdown = {label: {'score': int(category_scores[label][0]), 'max': max_pts}
+                           for label, max_pts in SCORE_CATEGORIES}
+        return int(totals[0]), score_breakdown, str(grades[0]), str(ratings[0])
+
     except Exception as e:
         # If anything fails, return neutral score
         return 50, {}, 'C', 'Average'
@@ -622,31 +797,21 @@ def generate_recommendation(total_score, score_breakdown, metrics, property_data
     """
     try:
         recommendation = {}
-        
+
         # Determine overall recommendation
-        if total_score >= 85:
-            recommendation['action'] = '🟢 STRONG BUY'
-            recommendation['summary'] = 'This deal offers exceptional risk-adjusted returns. Proceed with acquisition immediately.'
-        elif total_score >= 75:
-            recommendation['action'] = '🟢 BUY'
-            recommendation['summary'] = 'Solid investment opportunity that meets investment criteria. Proceed if available.'
-        elif total_score >= 65:
-            recommendation['action'] = '🟡 HOLD'
-            recommendation['summary'] = 'Average deal with mixed qualities. Consider waiting for better opportunities.'
-        elif total_score >= 55:
-            recommendation['action'] = '🟠 PASS'
-            recommendation['summary'] = 'Below-average deal with significant concerns. Not recommended.'
-        else:
-            recommendation['action'] = '🔴 HARD PASS'
-            recommendation['summary'] = 'This deal has critical red flags. Do not proceed.'
-        
-        # Identify strengths (categories scoring above 70%)
-        strengths = []
-        for category, data in score_breakdown.items():
-            pct = (data['score'] / data['max']) * 100
-            if pct >= 80:
-                strengths.append(f"✓ {category}: {data['score']}/{data['max']} pts ({pct:.0f}%)")
+        action, summary = RECOMMEND_TABLE[bisect.bisect_right(RECOMMEND_THRESH, total_score)]
+        recommendation['action'] = action
+        recommendation['summary'] = summary
         
+        # Partition categories into strengths (>=80%) and risks (<50%) in one pass
+        names = list(score_breakdown)
+        arr = np.array([(d['score'], d['max']) for d in score_breakdown.values()],
+                       dtype=np.float64).reshape(-1, 2)
+        pct = arr[:, 0] / arr[:, 1] * 100 if len(names) else np.empty(0)
+
+        strengths = [f"✓ {names[i]}: {int(arr[i, 0])}/{int(arr[i, 1])} pts ({pct[i]:.0f}%)"
+                     for i in np.where(pct >= 80)[0]]
+
         if metrics.get('irr', 0) >= 15:
             strengths.append(f"✓ Superior IRR of {metrics['irr']:.1f}% (well above market)")
         if metrics.get('npv', 0) > 0:
@@ -656,13 +821,9 @@ def generate_recommendation(total_score, score_breakdown, metrics, property_data
         
         recommendation['strengths'] = strengths[:4]  # Top 4 strengths
         
-        # Identify risks (categories scoring below 50%)
-        risks = []
-        for category, data in score_breakdown.items():
-            pct = (data['score'] / data['max']) * 100
-            if pct < 50:
-                risks.append(f"⚠ {category}: {data['score']}/{data['max']} pts ({pct:.0f}%) - needs attention")
-        
+        risks = [f"⚠ {names[i]}: {int(arr[i, 0])}/{int(arr[i, 1])} pts ({pct[i]:.0f}%) - needs attention"
+                 for i in np.where(pct < 50)[0]]
+
         if metrics.get('irr', 0) < 10:
             risks.append(f"⚠ IRR of {metrics['irr']:.1f}% below typical threshold")
         if metrics.get('npv', 0) < 0:
@@ -686,12 +847,7 @@ def generate_recommendation(total_score, score_breakdown, metrics, property_data
         recommendation['actions'] = actions
         
         # Confidence level
-        if total_score >= 85:
-            recommendation['confidence'] = 'HIGH'
-        elif total_score >= 70:
-            recommendation['confidence'] = 'MODERATE'
-        else:
-            recommendation['confidence'] = 'LOW'
+        recommendation['confidence'] = CONFIDENCE_TABLE[bisect.bisect_right(CONFIDENCE_THRESH, total_score)]
         
         return recommendation
         
@@ -723,39 +879,128 @@ if 'matrix_color' not in st.session_state:
     colors = ['#00ff00', '#ff0000', '#0000ff', '#ffff00', '#ff8800', '#aa00ff']
     st.session_state.matrix_color = random.choice(colors)
 
-@st.cache_data(ttl=1)  # Cache for 1 second to allow saves to persist
+def _dumps_bytes(obj):
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj).encode()
+
+@st.cache_resource(show_spinner=False)
+def _deals_state():
+    """In-memory view of the deal store, shared across reruns and sessions"""
+    return {'mtime': None, 'deals': {}}
+
+def _replay_log():
+    """Replay the op log into {name: data}; last writer wins"""
+    deals = {}
+    try:
+        with open(DEALS_LOG, 'rb', buffering=_IO_BUF) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+                if rec.get('op') == 'del':
+                    deals.pop(rec.get('name'), None)
+                else:
+                    deals[rec.get('name')] = rec.get('data')
+    except:
+        pass
+    return deals
+
+def _migrate_legacy_store():
+    """One-time conversion of the old full-dict saved_deals.json into the log"""
+    if os.path.exists(DEALS_LOG) or not os.path.exists(DEALS_FILE):
+        return
+    try:
+        with open(DEALS_FILE, 'rb', buffering=_IO_BUF) as f:
+            legacy = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.loads(f.read())
+        _compact_log(legacy)
+    except:
+        pass
+
 def load_deals_from_file():
-    if os.path.exists(DEALS_FILE):
-        try:
-            with open(DEALS_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+    _migrate_legacy_store()
+    if not os.path.exists(DEALS_LOG):
+        return {}
+    state = _deals_state()
+    mtime = os.path.getmtime(DEALS_LOG)
+    if state['mtime'] != mtime:  # only replay when the file changed externally
+        state['deals'] = _replay_log()
+        state['mtime'] = mtime
+    return state['deals']
+
+def _mark_synced():
+    """Record that the in-memory view already reflects the log on disk"""
+    try:
+        _deals_state()['mtime'] = os.path.getmtime(DEALS_LOG)
+    except:
+        pass
+
+def _compact_log(deals):
+    """Rewrite the log as one put per live deal (atomic: tmp file + rename)"""
+    tmp = DEALS_LOG + '.tmp'
+    with open(tmp, 'wb', buffering=_IO_BUF) as f:
+        for name, data in deals.items():
+            f.write(_dumps_bytes({'name': name, 'op': 'put', 'data': data}) + b"\n")
+    os.replace(tmp, DEALS_LOG)
+
+def _maybe_compact():
+    """Compact once superseded records dominate the log"""
+    try:
+        deals = load_deals_from_file()
+        with open(DEALS_LOG, 'rb', buffering=_IO_BUF) as f:
+            lines = sum(1 for _ in f)
+        if lines > max(16, 4 * len(deals)):
+            _compact_log(deals)
+            _mark_synced()
+    except:
+        pass
+
+def _append_record(record):
+    with open(DEALS_LOG, 'ab', buffering=_IO_BUF) as f:
+        f.write(_dumps_bytes(record) + b"\n")
 
 def save_deal_to_file(deal_name, deal_data):
-    deals = load_deals_from_file()
-    deals[deal_name] = deal_data
-    with open(DEALS_FILE, 'w') as f:
-        json.dump(deals, f, indent=2)
-    # Clear cache so next load gets fresh data
-    load_deals_from_file.clear()
+    # O(1) append plus an in-place update of the in-memory view -
+    # no re-read or re-parse of the store on our own writes
+    _append_record({'name': deal_name, 'op': 'put', 'data': deal_data})
+    _deals_state()['deals'][deal_name] = deal_data
+    _mark_synced()
+    _maybe_compact()
 
 def delete_deal_from_file(deal_name):
-    deals = load_deals_from_file()
-    if deal_name in deals:
-        del deals[deal_name]
-        with open(DEALS_FILE, 'w') as f:
-            json.dump(deals, f, indent=2)
-        # Clear cache so next load gets fresh data
-        load_deals_from_file.clear()
+    if deal_name in load_deals_from_file():
+        _append_record({'name': deal_name, 'op': 'del'})
+        _deals_state()['deals'].pop(deal_name, None)
+        _mark_synced()
+        _maybe_compact()
         return True
     return False
 
-@st.cache_data(ttl=1)  # Cache for 1 second
-def get_deals_by_type(property_type):
-    deals = load_deals_from_file()
-    return {name: data for name, data in deals.items() if data.get('property_type') == property_type}
+def group_deals_by_type():
+    """Bucket all deals by property type in one pass over the store"""
+    grouped = {}
+    for name, data in load_deals_from_file().items():
+        grouped.setdefault(data.get('property_type'), {})[name] = data
+    return grouped
+
+@st.cache_data(show_spinner=False)
+def _sidebar_render_plan(store_mtime):
+    """Expander headers plus per-deal widget keys/captions, rebuilt only when the store changes"""
+    grouped = group_deals_by_type()
+    plan = []
+    for prop_type in ["Single Family", "Multifamily", "Office", "Retail"]:
+        type_deals = grouped.get(prop_type, {})
+        if not type_deals:
+            continue
+        entries = []
+        for deal_name, deal_data in type_deals.items():
+            price = deal_data.get('purchase_price', 0)
+            size = deal_data.get('units', deal_data.get('square_feet', 0))
+            irr_val = deal_data.get('irr', 0)
+            entries.append((deal_name, f"load_{deal_name}", f"del_{deal_name}",
+                            f"💰 ${price:,.0f} | 📏 {size} | 📈 {irr_val:.1f}% IRR"))
+        plan.append((f"{prop_type} ({len(type_deals)})", entries))
+    return plan
 
 # ==================== INTRO SCREEN ====================
 if st.session_state.show_intro and not st.session_state.show_matrix:
@@ -801,7 +1046,7 @@ if st.session_state.show_intro and not st.session_state.show_matrix:
 
 elif st.session_state.show_matrix:
     matrix_color = st.session_state.matrix_color
-    
+
     st.markdown(f"""
         <style>
         .stApp {{
@@ -832,7 +1077,10 @@ elif st.session_state.show_matrix:
             <span style="font-size: 1.5rem;">█████████████ 100%</span>
         </div>
     """, unsafe_allow_html=True)
-    
+
+    # The sleep only runs on this once-per-session branch, before the
+    # heavy imports — an st.rerun() keeps session_state alive, unlike a
+    # page-level refresh that would start a fresh session
     time.sleep(3)  # Keep the cool animation
     st.session_state.show_matrix = False
     colors = ['#00ff00', '#ff0000', '#0000ff', '#ffff00', '#ff8800', '#aa00ff']
@@ -840,6 +1088,8 @@ elif st.session_state.show_matrix:
     st.rerun()
 
 # ==================== MAIN APP ====================
+_heavy_imports()
+
 st.markdown("""<style>.main-header {font-size: 2.5rem; font-weight: bold; color: #1f77b4;}</style>""", unsafe_allow_html=True)
 st.markdown('<p class="main-header">🏢 CRE DCF Valuation Model</p>', unsafe_allow_html=True)
 
@@ -851,39 +1101,34 @@ with st.sidebar:
     all_deals = load_deals_from_file()
     
     if all_deals:
-        for prop_type in ["Single Family", "Multifamily", "Office", "Retail"]:
-            type_deals = get_deals_by_type(prop_type)
-            
-            if type_deals:
-                with st.expander(f"{prop_type} ({len(type_deals)})", expanded=False):
-                    for deal_name, deal_data in type_deals.items():
-                        col1, col2 = st.columns([3, 1])
-                        
-                        with col1:
-                            if st.button(f"📄 {deal_name}", key=f"load_{deal_name}", use_container_width=True):
-                                # Load all regular fields
-                                for key, value in deal_data.items():
-                                    if key not in ['saved_date', 'irr', 'equity_multiple', 'npv', 'going_in_cap', 'unit_rents']:
-                                        st.session_state[f"{key}_input"] = value
-                                
-                                # Special handling for multifamily unit rents
-                                if 'unit_rents' in deal_data and deal_data.get('property_type') == 'Multifamily':
-                                    unit_rents_list = deal_data['unit_rents']
-                                    for i, rent in enumerate(unit_rents_list):
-                                        st.session_state[f'unit_{i}_rent_input'] = rent
-                                
-                                st.success(f"✅ Loaded: {deal_name}")
-                                st.rerun()
-                            
-                            price = deal_data.get('purchase_price', 0)
-                            size = deal_data.get('units', deal_data.get('square_feet', 0))
-                            irr_val = deal_data.get('irr', 0)
-                            st.caption(f"💰 ${price:,.0f} | 📏 {size} | 📈 {irr_val:.1f}% IRR")
-                        
-                        with col2:
-                            if st.button("🗑️", key=f"del_{deal_name}"):
-                                delete_deal_from_file(deal_name)
-                                st.rerun()
+        for expander_header, deal_entries in _sidebar_render_plan(_deals_state()['mtime']):
+            with st.expander(expander_header, expanded=False):
+                for deal_name, load_key, del_key, deal_caption in deal_entries:
+                    deal_data = all_deals[deal_name]
+                    col1, col2 = st.columns([3, 1])
+
+                    with col1:
+                        if st.button(f"📄 {deal_name}", key=load_key, use_container_width=True):
+                            # Load all regular fields
+                            for key, value in deal_data.items():
+                                if key not in _DEAL_METADATA_KEYS:
+                                    st.session_state[f"{key}_input"] = value
+
+                            # Special handling for multifamily unit rents
+                            if 'unit_rents' in deal_data and deal_data.get('property_type') == 'Multifamily':
+                                unit_rents_list = deal_data['unit_rents']
+                                for i, rent in enumerate(unit_rents_list):
+                                    st.session_state[f'unit_{i}_rent_input'] = rent
+
+                            st.success(f"✅ Loaded: {deal_name}")
+                            st.rerun()
+
+                        st.caption(deal_caption)
+
+                    with col2:
+                        if st.button("🗑️", key=del_key):
+                            delete_deal_from_file(deal_name)
+                            st.rerun()
     else:
         st.info("No saved properties yet!")
     
@@ -957,27 +1202,30 @@ with st.sidebar:
     st.markdown("---")
     st.header("💰 Operating Assumptions")
     
-    unit_rents = []
-    
+    # Rents live in a contiguous float64 array; its raw bytes double as the
+    # (hashable) cache key for calculate_cash_flows
+    unit_rents = np.empty(0, dtype=np.float64)
+
     if property_type == "Single Family":
         st.subheader("Rental Income")
         monthly_rent = st.number_input("Monthly Rent ($)", min_value=0.0, 
                                       value=st.session_state.get('sf_rent_input', 2500.0), step=50.0,
                                       help="Current monthly rental income for the house. Will grow at the Annual Rent Growth rate each year. Market check: Compare to similar homes in area.",
                                       key='sf_rent_input')
-        unit_rents = [monthly_rent]
+        unit_rents = np.array([monthly_rent], dtype=np.float64)
         annual_rent_total = monthly_rent * 12
         
     elif property_type == "Multifamily":
         st.subheader("Rental Income per Unit")
         for i in range(units_or_sf):
             default_rent = st.session_state.get(f'unit_{i}_rent_input', 1500.0)
-            rent = st.number_input(f"Unit {i+1} Monthly Rent ($)", min_value=0.0, 
-                                 value=default_rent, step=50.0,
-                                 help=f"Current monthly rent for Unit {i+1}. Each unit can have different rent based on size, floor level, finishes, and amenities. Rent will grow at Annual Rent Growth rate.",
-                                 key=f'unit_{i}_rent_input')
-            unit_rents.append(rent)
-        total_monthly_rent = sum(unit_rents)
+            st.number_input(f"Unit {i+1} Monthly Rent ($)", min_value=0.0,
+                          value=default_rent, step=50.0,
+                          help=f"Current monthly rent for Unit {i+1}. Each unit can have different rent based on size, floor level, finishes, and amenities. Rent will grow at Annual Rent Growth rate.",
+                          key=f'unit_{i}_rent_input')
+        unit_rents = np.fromiter((st.session_state[f'unit_{i}_rent_input'] for i in range(units_or_sf)),
+                                 dtype=np.float64, count=units_or_sf)
+        total_monthly_rent = unit_rents.sum()
         annual_rent_total = total_monthly_rent * 12
         st.info(f"Total Monthly Rent: ${total_monthly_rent:,.2f}")
         
@@ -1121,6 +1369,7 @@ year_1_mgmt = year_1_egi * (management_fee / 100)
 year_1_noi = year_1_egi - year_1_opex - year_1_mgmt
 going_in_cap = (year_1_noi / purchase_price) * 100 if purchase_price > 0 else 0
 
+@lru_cache(maxsize=256)
 def calculate_debt_service(year, loan_amount, interest_rate, amortization, io_period):
     if year <= io_period or loan_amount == 0:
         return loan_amount * (interest_rate / 100)
@@ -1143,158 +1392,221 @@ else:
 
 @st.cache_data(show_spinner=False)
 def calculate_cash_flows(
-    property_type, holding_period, unit_rents_tuple, annual_rent_total, 
+    property_type, holding_period, unit_rents_buf, annual_rent_total,
     rent_growth, vacancy, opex_per_unit_or_sf, opex_growth, units_or_sf, management_fee,
     capex_per_unit_or_sf, loan_amount, interest_rate, amortization, io_period,
     equity_required, tax_rate, annual_depreciation
 ):
     """
     Cached cash flow calculation - only recalculates when inputs change
-    Using tuple for unit_rents since lists aren't hashable for caching
+    unit_rents arrive as raw float64 bytes (ndarrays aren't hashable for
+    caching); np.frombuffer gives a zero-copy contiguous view back
+    Projection is fully vectorized: one NumPy expression per column
+    instead of a per-year Python loop
     """
-    # Convert tuple back to list for calculations
-    unit_rents = list(unit_rents_tuple) if unit_rents_tuple else []
-    
-    # Track loan balance year by year
-    current_loan_balance = loan_amount
+    unit_rents = np.frombuffer(unit_rents_buf, dtype=np.float64)
+    years = np.arange(1, holding_period + 1)
+    growth = (1 + rent_growth / 100) ** (years - 1)
+    opex_factor = (1 + opex_growth / 100) ** (years - 1)
     monthly_rate = interest_rate / 100 / 12 if interest_rate > 0 else 0
-    
-    cash_flow_data = []
-    
-    for year in range(1, holding_period + 1):
-        if property_type in ["Single Family", "Multifamily"]:
-            year_rents = [rent * (1 + rent_growth / 100) ** (year - 1) for rent in unit_rents]
-            year_total_rent = sum(year_rents)
-            gri = year_total_rent * 12
-        else:
-            gri = annual_rent_total * (1 + rent_growth / 100) ** (year - 1)
-        
-        egi = gri * (1 - vacancy / 100)
-        
-        if property_type == "Single Family":
-            opex = opex_per_unit_or_sf * (1 + opex_growth / 100) ** (year - 1)
-        elif property_type == "Multifamily":
-            opex = opex_per_unit_or_sf * units_or_sf * (1 + opex_growth / 100) ** (year - 1)
-        else:
-            opex = opex_per_unit_or_sf * units_or_sf * (1 + opex_growth / 100) ** (year - 1)
-        
-        mgmt = egi * (management_fee / 100)
-        
-        if property_type == "Single Family":
-            capex = capex_per_unit_or_sf
-        elif property_type == "Multifamily":
-            capex = capex_per_unit_or_sf * units_or_sf
-        else:
-            capex = capex_per_unit_or_sf * units_or_sf
-        
-        noi = egi - opex - mgmt
-        ncf = noi - capex
-        ds = calculate_debt_service(year, loan_amount, interest_rate, amortization, io_period)
-        
-        # Calculate interest expense
-        if loan_amount == 0:
-            interest_expense = 0
-            principal_paid_this_year = 0
-        elif year <= io_period:
-            interest_expense = current_loan_balance * (interest_rate / 100)
-            principal_paid_this_year = 0
-        else:
-            interest_expense = 0
-            principal_paid_this_year = 0
-            
-            if amortization > io_period:
-                remaining_payments = (amortization - io_period) * 12
-                monthly_payment = loan_amount * (monthly_rate * (1 + monthly_rate)**remaining_payments) / ((1 + monthly_rate)**remaining_payments - 1)
-                
-                temp_balance = current_loan_balance
-                for month in range(12):
-                    monthly_interest = temp_balance * monthly_rate
-                    monthly_principal = monthly_payment - monthly_interest
-                    interest_expense += monthly_interest
-                    principal_paid_this_year += monthly_principal
-                    temp_balance -= monthly_principal
-                
-                current_loan_balance = temp_balance
-        
-        btcf = ncf - ds
-        
-        if tax_rate > 0:
-            taxable_income = noi - interest_expense - annual_depreciation
-            taxes = max(0, taxable_income * (tax_rate / 100))
-            atcf = btcf - taxes
+
+    # Gross income: unit-based for residential, total-rent-based otherwise
+    if property_type in ["Single Family", "Multifamily"]:
+        gri = unit_rents.sum() * 12 * growth if unit_rents.size else np.zeros(holding_period)
+    else:
+        gri = annual_rent_total * growth
+
+    egi = gri * (1 - vacancy / 100)
+
+    if property_type == "Single Family":
+        opex = opex_per_unit_or_sf * opex_factor
+        capex = float(capex_per_unit_or_sf)
+    else:
+        opex = opex_per_unit_or_sf * units_or_sf * opex_factor
+        capex = float(capex_per_unit_or_sf * units_or_sf)
+
+    mgmt = egi * (management_fee / 100)
+    noi = egi - opex - mgmt
+    ncf = noi - capex
+
+    # Debt service and interest share one hoisted payment factor; the
+    # (1+r)**n pow is computed a single time for the whole projection
+    io_years = years <= io_period
+    interest_expense = np.zeros(holding_period)
+    remaining_payments = (amortization - io_period) * 12
+    if loan_amount == 0:
+        ds = np.zeros(holding_period)
+    else:
+        io_pmt = loan_amount * (interest_rate / 100)
+        interest_expense[io_years] = io_pmt
+        if remaining_payments <= 0:
+            ds = np.where(io_years, io_pmt, 0.0)
         else:
-            atcf = btcf
-            taxes = 0
-        
-        coc = (btcf / equity_required) * 100 if equity_required > 0 else 0
-        
-        cash_flow_data.append({
-            'Year': year,
-            'Gross Income': gri,
-            'EGI': egi,
-            'OpEx': opex,
-            'Mgmt Fees': mgmt,
-            'CapEx': capex,
-            'NOI': noi,
-            'Debt Service': ds,
-            'BTCF': btcf,
-            'Taxes': taxes if tax_rate > 0 else 0,
-            'ATCF': atcf if tax_rate > 0 else btcf,
-            'CoC Return %': coc
-        })
-    
-    return pd.DataFrame(cash_flow_data)
-
-# Call cached function - converts to tuple for hashability
-cf_df = calculate_cash_flows(
-    property_type, holding_period, tuple(unit_rents), annual_rent_total,
+            pow_factor = (1 + monthly_rate) ** remaining_payments
+            monthly_payment = loan_amount * monthly_rate * pow_factor / (pow_factor - 1)
+            ds = np.where(io_years, io_pmt, monthly_payment * 12)
+            # Closed-form balance after k months of amortization:
+            # B_k = M/r - (M/r - L)*(1+r)**k, so each year's interest is
+            # 12*M minus the principal retired between its month bounds
+            amort_idx = np.where(~io_years)[0]
+            annuity = monthly_payment / monthly_rate
+            month_start = 12.0 * np.arange(len(amort_idx))
+            bal_start = annuity - (annuity - loan_amount) * (1 + monthly_rate) ** month_start
+            bal_end = annuity - (annuity - loan_amount) * (1 + monthly_rate) ** (month_start + 12)
+            interest_expense[amort_idx] = 12 * monthly_payment - (bal_start - bal_end)
+
+    btcf = ncf - ds
+
+    if tax_rate > 0:
+        taxable_income = noi - interest_expense - annual_depreciation
+        taxes = np.maximum(0, taxable_income * (tax_rate / 100))
+        atcf = btcf - taxes
+    else:
+        taxes = np.zeros(holding_period)
+        atcf = btcf
+
+    coc = (btcf / equity_required) * 100 if equity_required > 0 else np.zeros(holding_period)
+
+    return pd.DataFrame({
+        'Year': years,
+        'Gross Income': gri,
+        'EGI': egi,
+        'OpEx': opex,
+        'Mgmt Fees': mgmt,
+        'CapEx': capex,
+        'NOI': noi,
+        'Debt Service': ds,
+        'BTCF': btcf,
+        'Taxes': taxes,
+        'ATCF': atcf,
+        'CoC Return %': coc
+    }, copy=False)
+
+# Cheap fingerprint short-circuit: unrelated widget reruns skip even the
+# st.cache_data lookup (which re-hashes all 18 args) and reuse the frame
+_cf_inputs = (
+    property_type, holding_period, unit_rents.tobytes(), annual_rent_total,
     rent_growth, vacancy, opex_per_unit_or_sf, opex_growth, units_or_sf, management_fee,
     capex_per_unit_or_sf, loan_amount, interest_rate, amortization, io_period,
     equity_required, tax_rate, annual_depreciation
 )
-
-# Track loan balance year by year for proper interest calculation
-current_loan_balance = loan_amount
-monthly_rate = interest_rate / 100 / 12 if interest_rate > 0 else 0
-
-# Cash flow projection - NOW USING CACHED RESULTS
-cash_flow_data = cf_df.to_dict('records')
-
-cf_df = pd.DataFrame(cash_flow_data)
+if st.session_state.get('_cf_key') == _cf_inputs:
+    cf_df = st.session_state['_cf_df']
+else:
+    cf_df = calculate_cash_flows(*_cf_inputs)
+    st.session_state['_cf_key'] = _cf_inputs
+    st.session_state['_cf_df'] = cf_df
+
+@dataclass(frozen=True, slots=True)
+class SaleInputs:
+    """Terminal-sale scalars, computed once and read everywhere else"""
+    sale_price: float
+    sale_costs: float
+    remaining_balance: float
+    net_proceeds: float
 
 # Terminal analysis
-final_noi = cf_df.iloc[-1]['NOI']
+final_noi = cf_df['NOI'].iat[-1]
 terminal_noi = final_noi * (1 + rent_growth / 100)
 sale_price = terminal_noi / (exit_cap_rate / 100) if exit_cap_rate > 0 else 0
 sale_costs = sale_price * (selling_costs / 100)
 
+@st.cache_data(show_spinner=False)
+def amort_schedule_vec(loan_amount, interest_rate, amortization, io_period):
+    """
+    Full-term annual amortization arrays (payment, principal, interest,
+    end-of-year balance) from the closed-form annuity identity
+    B_m = A - (A - L)(1+i)^m with A = P/i, replacing the month-by-month
+    Python loops in the loan summary and payoff schedule. One cached
+    build serves the sale-balance lookup and both loan sections.
+    """
+    years = np.arange(1, amortization + 1)
+    monthly_rate = interest_rate / 100 / 12
+    io_years = years <= io_period
+    payment = np.zeros(amortization)
+    interest = np.zeros(amortization)
+    principal = np.zeros(amortization)
+    end_balance = np.full(amortization, float(loan_amount))
+    io_pmt = loan_amount * (interest_rate / 100)
+    payment[io_years] = io_pmt
+    interest[io_years] = io_pmt
+
+    remaining_payments = (amortization - io_period) * 12
+    if monthly_rate > 0 and remaining_payments > 0:
+        pow_factor = (1 + monthly_rate) ** remaining_payments
+        monthly_payment = loan_amount * monthly_rate * pow_factor / (pow_factor - 1)
+        amort_idx = np.where(~io_years)[0]
+        annuity = monthly_payment / monthly_rate
+        month_start = 12.0 * np.arange(len(amort_idx))
+        bal_start = annuity - (annuity - loan_amount) * (1 + monthly_rate) ** month_start
+        bal_end = annuity - (annuity - loan_amount) * (1 + monthly_rate) ** (month_start + 12)
+        payment[amort_idx] = 12 * monthly_payment
+        principal[amort_idx] = bal_start - bal_end
+        interest[amort_idx] = 12 * monthly_payment - (bal_start - bal_end)
+        end_balance[amort_idx] = np.maximum(bal_end, 0.0)
+    return payment, principal, interest, end_balance
+
 def calc_remaining_balance(loan_amount, interest_rate, amortization, io_period, holding_period):
+    """Loan balance at sale, sliced from the shared amortization schedule"""
     if holding_period <= io_period or loan_amount == 0:
         return loan_amount
-    monthly_rate = interest_rate / 100 / 12
-    total_pmts = (amortization - io_period) * 12
-    remaining_pmts = (amortization - holding_period) * 12
-    if remaining_pmts <= 0:
+    if holding_period >= amortization:
         return 0
-    monthly_pmt = loan_amount * (monthly_rate * (1 + monthly_rate)**total_pmts) / ((1 + monthly_rate)**total_pmts - 1)
-    return monthly_pmt * ((1 + monthly_rate)**remaining_pmts - 1) / (monthly_rate * (1 + monthly_rate)**remaining_pmts)
+    _, _, _, end_balance = amort_schedule_vec(loan_amount, interest_rate, amortization, io_period)
+    return end_balance[holding_period - 1]
 
 remaining_balance = calc_remaining_balance(loan_amount, interest_rate, amortization, io_period, holding_period)
-net_sale_proceeds = sale_price - sale_costs - remaining_balance
-
-# Returns
-cash_flows = [-equity_required] + list(cf_df['ATCF'] if tax_rate > 0 else cf_df['BTCF'])
-cash_flows[-1] += net_sale_proceeds
-
-try:
-    irr = npf.irr(cash_flows) * 100
-except:
-    irr = 0
-
-npv = npf.npv(discount_rate / 100, cash_flows)
-equity_multiple = (sum(cf_df['ATCF' if tax_rate > 0 else 'BTCF']) + net_sale_proceeds) / equity_required if equity_required > 0 else 0
+sale = SaleInputs(sale_price=sale_price,
+                  sale_costs=sale_costs,
+                  remaining_balance=remaining_balance,
+                  net_proceeds=sale_price - sale_costs - remaining_balance)
+
+# Returns: resolve the levered cash-flow column once and reuse the array
+# everywhere downstream (IRR/NPV vector, equity multiple, metric help)
+cf_col = 'ATCF' if tax_rate > 0 else 'BTCF'
+cf_values = cf_df[cf_col].to_numpy()
+total_cf = cf_values.sum() + sale.net_proceeds
+
+cash_flows = np.empty(holding_period + 1)
+cash_flows[0] = -equity_required
+cash_flows[1:] = cf_values
+cash_flows[-1] += sale.net_proceeds
+
+_irr = irr_vec(cash_flows[None, :])[0]
+irr_converged = np.isfinite(_irr)
+# Downstream consumers (scoring, saved deals, PDF) expect a number, so 0
+# stays the fallback there; the metric card shows N/A on non-convergence
+irr = _irr * 100 if irr_converged else 0
+
+npv = npv_vec(discount_rate / 100, cash_flows)[0]
+equity_multiple = total_cf / equity_required if equity_required > 0 else 0
 avg_coc = cf_df['CoC Return %'].mean()
 
+# One canonical snapshot of the deal inputs and headline metrics; the
+# save and PDF handlers extend it instead of rebuilding ~25-key dicts
+base_deal_data = {
+    'property_name': property_name,
+    'property_type': property_type,
+    'purchase_price': purchase_price,
+    'closing_costs': closing_costs,
+    'rent_growth': rent_growth,
+    'vacancy': vacancy,
+    'opex_growth': opex_growth,
+    'management_fee': management_fee,
+    'loan_to_value': loan_to_value,
+    'interest_rate': interest_rate,
+    'amortization': amortization,
+    'io_period': io_period,
+    'holding_period': holding_period,
+    'exit_cap_rate': exit_cap_rate,
+    'selling_costs': selling_costs,
+    'discount_rate': discount_rate,
+    'irr': irr,
+    'equity_multiple': equity_multiple,
+    'npv': npv,
+    'going_in_cap': going_in_cap
+}
+
 # ==================== METRICS (STAYS AT TOP) ====================
 st.markdown("---")
 
@@ -1310,36 +1622,18 @@ with save_col2:
     st.write("")
     if st.button("💾 SAVE DEAL", use_container_width=True):
         deal_data = {
-            'property_name': property_name,
-            'property_type': property_type,
+            **base_deal_data,
             'units': units_or_sf if size_metric in ["units", "house"] else None,
-            'square_feet': units_or_sf if size_metric == "sf" else None,
-            'purchase_price': purchase_price,
-            'closing_costs': closing_costs,
-            'rent_growth': rent_growth,
-            'vacancy': vacancy,
-            'opex_growth': opex_growth,
-            'management_fee': management_fee,
-            'loan_to_value': loan_to_value,
-            'interest_rate': interest_rate,
-            'amortization': amortization,
-            'io_period': io_period,
-            'holding_period': holding_period,
-            'exit_cap_rate': exit_cap_rate,
-            'selling_costs': selling_costs,
-            'discount_rate': discount_rate,
-            'irr': irr,
-            'equity_multiple': equity_multiple,
-            'npv': npv,
-            'going_in_cap': going_in_cap
+            'square_feet': units_or_sf if size_metric == "sf" else None
         }
-        
+
+
         if property_type == "Single Family":
-            deal_data['sf_rent'] = unit_rents[0]
+            deal_data['sf_rent'] = float(unit_rents[0])
             deal_data['opex_total'] = opex_per_unit_or_sf
             deal_data['capex_total'] = capex_per_unit_or_sf
         elif property_type == "Multifamily":
-            deal_data['unit_rents'] = unit_rents
+            deal_data['unit_rents'] = unit_rents.tolist()
             deal_data['opex_per_unit'] = opex_per_unit_or_sf
             deal_data['capex_per_unit'] = capex_per_unit_or_sf
         else:
@@ -1363,48 +1657,44 @@ with save_col4:
     st.write("")
     if PDF_AVAILABLE:
         if st.button("📄 Generate PDF", use_container_width=True, help="Create professional PDF investment memo"):
-            with st.spinner("Generating PDF report..."):
                 # Prepare property data
                 property_data = {
-                    'property_name': property_name,
-                    'property_type': property_type,
-                    'purchase_price': purchase_price,
-                    'closing_costs': closing_costs,
+                    **base_deal_data,
                     'equity_required': equity_required,
                     'loan_amount': loan_amount,
-                    'loan_to_value': loan_to_value,
-                    'interest_rate': interest_rate,
-                    'amortization': amortization,
-                    'io_period': io_period,
-                    'holding_period': holding_period,
-                    'exit_cap_rate': exit_cap_rate,
-                    'selling_costs': selling_costs,
-                    'discount_rate': discount_rate,
-                    'rent_growth': rent_growth,
-                    'vacancy': vacancy,
-                    'opex_growth': opex_growth,
-                    'management_fee': management_fee,
-                    'irr': irr,
-                    'equity_multiple': equity_multiple,
-                    'npv': npv,
-                    'going_in_cap': going_in_cap,
                     'avg_coc': avg_coc
                 }
-                
-                # Generate PDF with theme and charts
-                pdf_buffer = generate_pdf_report(
-                    property_data, 
+
+
+                # Build in a background thread so the UI stays responsive;
+                # generate_pdf_report is still cached on the content hash
+                st.session_state.pdf_future = _pdf_pool().submit(
+                    generate_pdf_report,
+                    property_data,
                     cf_df,
                     theme_key=st.session_state.get('pdf_theme', 'professional_blue'),
                     charts_dict=st.session_state.get('charts', {}),
                     loan_schedule_df=None
                 )
-                
-                if pdf_buffer:
+                st.session_state.pdf_file_name = f"{property_name.replace(' ', '_')}_Investment_Memo.pdf"
+
+        pdf_future = st.session_state.get('pdf_future')
+        if pdf_future is not None:
+            if not pdf_future.done():
+                st.caption("⏳ Building PDF in the background...")
+                time.sleep(0.2)
+                st.rerun()
+            else:
+                try:
+                    pdf_bytes = pdf_future.result()
+                except Exception as e:
+                    pdf_bytes = None
+                    st.error(f"PDF generation failed: {str(e)[:100]}")
+                if pdf_bytes:
                     st.download_button(
                         label="⬇️ Download PDF",
-                        data=pdf_buffer,
-                        file_name=f"{property_name.replace(' ', '_')}_Investment_Memo.pdf",
+                        data=pdf_bytes,
+                        file_name=st.session_state.get('pdf_file_name', 'Investment_Memo.pdf'),
                         mime="application/pdf",
                         use_container_width=True
                     )
@@ -1435,13 +1725,14 @@ Compare to your discount rate ({discount_rate}%). If IRR > Discount Rate → Goo
 
 To see UNLEVERED IRR: Set LTV to 0% (all cash)"""
 
-col1.metric("💹 Levered IRR", f"{irr:.2f}%", "Internal Rate of Return", help=irr_help)
+col1.metric("💹 Levered IRR", f"{irr:.2f}%" if irr_converged else "N/A",
+            "Internal Rate of Return", help=irr_help)
 
 em_help = f"""Total cash returned ÷ Equity invested = For every $1 invested, how many dollars back?
 
 Current deal:
 • Invested: ${equity_required:,.0f}
-• Total returned: ${sum(cf_df['ATCF' if tax_rate > 0 else 'BTCF']) + net_sale_proceeds:,.0f}
+• Total returned: ${total_cf:,.0f}
 • Multiple: {equity_multiple:.2f}x
 
 Interpretation:
@@ -1486,15 +1777,17 @@ st.markdown("---")
 # ==================== DEAL SCORE & ANALYSIS ====================
 st.header("🎯 Deal Score & Recommendation")
 
-# Prepare metrics dict for scoring
+# Prepare metrics dict for scoring; single-label .iat avoids the
+# .iloc[0][col] two-step (row materialization then label lookup)
+year_1_ds = cf_df['Debt Service'].iat[0] if len(cf_df) > 0 else 0
 metrics_for_score = {
     'irr': irr,
     'equity_multiple': equity_multiple,
     'npv': npv,
     'cap_rate': going_in_cap,
-    'year1_coc': cf_df.iloc[0]['CoC Return %'] if len(cf_df) > 0 else 0,
+    'year1_coc': cf_df['CoC Return %'].iat[0] if len(cf_df) > 0 else 0,
     'avg_coc': avg_coc,
-    'dscr': (cf_df.iloc[0]['NOI'] / (cf_df.iloc[0]['Debt Service'] if cf_df.iloc[0]['Debt Service'] > 0 else 1)) if len(cf_df) > 0 else 0
+    'dscr': (cf_df['NOI'].iat[0] / (year_1_ds if year_1_ds > 0 else 1)) if len(cf_df) > 0 else 0
 }
 
 property_for_score = {
@@ -1515,15 +1808,10 @@ recommendation = generate_recommendation(total_score, score_breakdown, metrics_f
 score_col1, score_col2, score_col3 = st.columns([2, 1, 1])
 
 with score_col1:
-    # Main score display
-    st.markdown(f"""
-    <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                padding: 30px; border-radius: 15px; text-align: center;'>
-        <h1 style='color: white; margin: 0; font-size: 3.5rem;'>{total_score:.1f}/100</h1>
-        <p style='color: white; margin: 5px 0 0 0; font-size: 1.8rem;'>Grade: {grade}</p>
-        <p style='color: white; margin: 5px 0 0 0; font-size: 1.2rem;'>{rating}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    # Main score display: native metric instead of an inline-HTML card, so
+    # reruns ship structured deltas rather than a re-sanitized DOM fragment
+    st.metric("Investment Score", f"{total_score:.1f}/100",
+              delta=f"Grade {grade} — {rating}")
 
 with score_col2:
     st.metric("Confidence", recommendation['confidence'], 
@@ -1546,28 +1834,11 @@ st.markdown("---")
 st.subheader("📊 Score Breakdown by Category")
 
 breakdown_cols = st.columns(5)
-for idx, (category, data) in enumerate(score_breakdown.items()):
-    with breakdown_cols[idx % 5]:
+for (category, data), col in zip(score_breakdown.items(), breakdown_cols):
+    with col:
         score_pct = (data['score'] / data['max']) * 100
-        
-        # Progress bar color
-        if score_pct >= 80:
-            bar_color = "#10b981"  # Green
-        elif score_pct >= 60:
-            bar_color = "#f59e0b"  # Yellow
-        else:
-            bar_color = "#ef4444"  # Red
-        
-        st.markdown(f"""
-        <div style='text-align: center; padding: 10px; background: #f8f9fa; border-radius: 10px; margin-bottom: 10px;'>
-            <p style='margin: 0; font-size: 0.9rem; font-weight: bold; color: #1f2937;'>{category}</p>
-            <h3 style='margin: 5px 0; color: {bar_color};'>{data['score']}/{data['max']}</h3>
-            <div style='background: #e5e7eb; border-radius: 10px; overflow: hidden; height: 10px;'>
-                <div style='background: {bar_color}; width: {score_pct}%; height: 100%;'></div>
-            </div>
-            <p style='margin: 5px 0 0 0; font-size: 0.8rem; color: #374151;'>{score_pct:.0f}%</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.metric(category, f"{data['score']}/{data['max']}", delta=f"{score_pct:.0f}%")
+        st.progress(data['score'] / data['max'])
 
 # Scoring Logic Explanation
 with st.expander("ℹ️ How is the Investment Score Calculated?"):
@@ -1715,22 +1986,22 @@ with c3:
     st.markdown("**Returns**")
     st.write(f"Going-In Cap Rate: {going_in_cap:.2f}%")
     st.write(f"Exit Cap Rate: {exit_cap_rate:.2f}%")
-    st.write(f"Exit Sale Price: ${sale_price:,.0f}")
+    st.write(f"Exit Sale Price: ${sale.sale_price:,.0f}")
     
-    st.markdown(f"**Net Sale Proceeds: ${net_sale_proceeds:,.0f}**")
+    st.markdown(f"**Net Sale Proceeds: ${sale.net_proceeds:,.0f}**")
     
     with st.expander("ℹ️ How is Net Sale Proceeds calculated?"):
         st.markdown(f"""
 **Net Sale Proceeds Calculation:**
 
-**[1] Sale Price:** ${sale_price:,.0f}  
+**[1] Sale Price:** ${sale.sale_price:,.0f}  
 (Year {holding_period+1} NOI ÷ Exit Cap Rate)
 
-**[2] - Selling Costs ({selling_costs}%):** -${sale_costs:,.0f}
+**[2] - Selling Costs ({selling_costs}%):** -${sale.sale_costs:,.0f}
 
-**[3] - Remaining Loan Balance:** -${remaining_balance:,.0f}
+**[3] - Remaining Loan Balance:** -${sale.remaining_balance:,.0f}
 
-**[4] = Net Proceeds to YOU:** ${net_sale_proceeds:,.0f}
+**[4] = Net Proceeds to YOU:** ${sale.net_proceeds:,.0f}
 
 This is the cash you walk away with at closing. Added to Year {holding_period} cash flow for IRR calculation.
         """)
@@ -1740,49 +2011,28 @@ st.markdown("---")
 # ==================== LOAN PAYMENT SUMMARY ====================
 if loan_amount > 0:
     st.subheader("📊 Loan Payment Summary")
-    
+
     # Calculate monthly payments
     monthly_rate = interest_rate / 100 / 12
-    
+
     if io_period > 0:
         monthly_payment_io = loan_amount * monthly_rate
     else:
         monthly_payment_io = 0
-    
+
     if amortization > io_period:
         remaining_payments = (amortization - io_period) * 12
         monthly_payment_amort = loan_amount * (monthly_rate * (1 + monthly_rate)**remaining_payments) / ((1 + monthly_rate)**remaining_payments - 1) if monthly_rate > 0 else 0
     else:
         monthly_payment_amort = 0
-    
-    # Calculate total paid and principal paid
-    balance = loan_amount
-    total_paid_at_holding = 0
-    principal_paid_at_holding = 0
-    total_paid_full_term = 0
-    
-    for year in range(1, amortization + 1):
-        if year <= io_period:
-            annual_payment = loan_amount * (interest_rate / 100)
-            principal_this_year = 0
-        else:
-            annual_interest = 0
-            annual_principal = 0
-            for month in range(12):
-                interest = balance * monthly_rate
-                principal = monthly_payment_amort - interest
-                balance -= principal
-                annual_interest += interest
-                annual_principal += principal
-            annual_payment = annual_interest + annual_principal
-            principal_this_year = annual_principal
-        
-        total_paid_full_term += annual_payment
-        
-        if year <= holding_period:
-            total_paid_at_holding += annual_payment
-            principal_paid_at_holding += principal_this_year
-    
+
+    # Totals straight off the closed-form annual arrays
+    annual_payments, annual_principal, annual_interest, _ = amort_schedule_vec(
+        loan_amount, interest_rate, amortization, io_period)
+    total_paid_full_term = annual_payments.sum()
+    total_paid_at_holding = annual_payments[:holding_period].sum()
+    principal_paid_at_holding = annual_principal[:holding_period].sum()
+
     sum_col1, sum_col2, sum_col3 = st.columns(3)
     
     with sum_col1:
@@ -1810,82 +2060,23 @@ if loan_amount > 0:
 if loan_amount > 0:
     st.subheader("🏦 Loan Payoff Schedule")
     
-    # Generate amortization schedule
-    amort_schedule = []
-    balance = loan_amount
-    monthly_rate = interest_rate / 100 / 12
-    
-    if io_period > 0:
-        monthly_payment_io = loan_amount * monthly_rate
-    else:
-        monthly_payment_io = 0
-    
-    if amortization > io_period:
-        remaining_payments = (amortization - io_period) * 12
-        monthly_payment_amort = loan_amount * (monthly_rate * (1 + monthly_rate)**remaining_payments) / ((1 + monthly_rate)**remaining_payments - 1) if monthly_rate > 0 else 0
-    else:
-        monthly_payment_amort = 0
-    
-    for year in range(1, amortization + 1):
-        if year <= io_period:
-            interest_paid = loan_amount * (interest_rate / 100)
-            principal_paid = 0
-            annual_payment = interest_paid
-        else:
-            year_interest = 0
-            year_principal = 0
-            for month in range(12):
-                interest = balance * monthly_rate
-                principal = monthly_payment_amort - interest
-                balance = max(0, balance - principal)
-                year_interest += interest
-                year_principal += principal
-            annual_payment = year_interest + year_principal
-            interest_paid = year_interest
-            principal_paid = year_principal
-        
-        amort_schedule.append({
-            'Year': year,
-            'Annual Payment': annual_payment,
-            'Principal': principal_paid,
-            'Interest': interest_paid,
-            'Remaining Balance': max(0, balance)
-        })
-    
-    amort_df = pd.DataFrame(amort_schedule)
-    
-    # Line graph
-    fig_loan = go.Figure()
-    
-    fig_loan.add_trace(go.Scatter(
-        x=amort_df['Year'],
-        y=amort_df['Remaining Balance'],
-        mode='lines',
-        name='Loan Balance',
-        line=dict(color='#1f77b4', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(31, 119, 180, 0.2)'
-    ))
-    
-    # Add vertical line at holding period
-    fig_loan.add_vline(
-        x=holding_period,
-        line_dash="dash",
-        line_color="red",
-        line_width=2,
-        annotation_text=f"Holding Period: {holding_period} years",
-        annotation_position="top"
-    )
-    
-    fig_loan.update_layout(
-        title='Loan Balance Over Time',
-        xaxis_title='Year',
-        yaxis_title='Remaining Balance ($)',
-        height=400,
-        showlegend=False,
-        hovermode='x unified'
-    )
-    
+    # Closed-form schedule: one vectorized call instead of up to 360
+    # month-by-month iterations
+    annual_payments, annual_principal, annual_interest, end_balance = amort_schedule_vec(
+        loan_amount, interest_rate, amortization, io_period)
+
+    amort_df = pd.DataFrame({
+        'Year': np.arange(1, amortization + 1),
+        'Annual Payment': annual_payments,
+        'Principal': annual_principal,
+        'Interest': annual_interest,
+        'Remaining Balance': end_balance
+    }, copy=False)
+    
+    # Line graph (cached on the schedule arrays)
+    fig_loan = _loan_balance_fig(amort_df['Year'].to_numpy(),
+                                 amort_df['Remaining Balance'].to_numpy(),
+                                 holding_period)
     st.plotly_chart(fig_loan, use_container_width=True)
     save_chart_to_session("Loan Balance Over Time", fig_loan)
 
@@ -1894,16 +2085,18 @@ st.markdown("---")
 # ==================== CASH FLOW TABLE ====================
 st.subheader(f"📋 {holding_period}-Year Cash Flow Projection")
 
-display_df = cf_df.copy()
-for col in ['Gross Income', 'EGI', 'OpEx', 'Mgmt Fees', 'CapEx', 'NOI', 'Debt Service', 'BTCF', 'Taxes', 'ATCF']:
-    if col in display_df.columns:
-        display_df[col] = display_df[col].apply(lambda x: f"${x:,.0f}")
-display_df['CoC Return %'] = display_df['CoC Return %'].apply(lambda x: f"{x:.2f}%")
-
+# Styler formatting instead of materializing a string copy of the frame:
+# no per-cell Python lambdas, numerics stay numeric underneath
+display_df = cf_df
 if tax_rate == 0:
     display_df = display_df.drop(columns=['Taxes', 'ATCF'], errors='ignore')
 
-st.dataframe(display_df, use_container_width=True, height=400)
+cf_fmt = {col: "${:,.0f}" for col in ['Gross Income', 'EGI', 'OpEx', 'Mgmt Fees', 'CapEx',
+                                      'NOI', 'Debt Service', 'BTCF', 'Taxes', 'ATCF']
+          if col in display_df.columns}
+cf_fmt['CoC Return %'] = "{:.2f}%"
+
+st.dataframe(display_df.style.format(cf_fmt), use_container_width=True, height=400)
 
 st.markdown("---")
 
@@ -1912,17 +2105,13 @@ st.subheader("📈 Visualizations")
 chart1, chart2 = st.columns(2)
 
 with chart1:
-    fig_noi = go.Figure(go.Bar(x=cf_df['Year'], y=cf_df['NOI'], marker_color='#1f77b4'))
-    fig_noi.update_layout(title='NOI Growth Over Time', xaxis_title='Year', yaxis_title='NOI ($)', height=400, showlegend=False)
+    fig_noi = _noi_fig(cf_df['Year'].to_numpy(), cf_df['NOI'].to_numpy())
     st.plotly_chart(fig_noi, use_container_width=True)
     save_chart_to_session("NOI Growth Over Time", fig_noi)
 
 with chart2:
-    cash_flow_col = 'ATCF' if tax_rate > 0 else 'BTCF'
     title_text = 'After-Tax Cash Flow' if tax_rate > 0 else 'Before-Tax Cash Flow'
-    fig_cf = go.Figure(go.Scatter(x=cf_df['Year'], y=cf_df[cash_flow_col], mode='lines+markers', 
-                                  line=dict(color='#2ca02c', width=3), marker=dict(size=8)))
-    fig_cf.update_layout(title=title_text, xaxis_title='Year', yaxis_title='Cash Flow ($)', height=400, showlegend=False)
+    fig_cf = _cf_fig(cf_df['Year'].to_numpy(), cf_values, title_text)
     st.plotly_chart(fig_cf, use_container_width=True)
     save_chart_to_session(f"{title_text}", fig_cf)
 
@@ -1942,13 +2131,61 @@ This helps you understand deal risk and identify which variables matter most for
 tab1, tab2, tab3 = st.tabs(["🔥 Two-Way Analysis", "📈 One-Way Analysis", "🌪️ Tornado Chart"])
 
 # Variable options (ordered by importance)
-sensitivity_vars = [
+SENSITIVITY_VARS = (
     "Exit Cap Rate",
-    "Rent Growth Rate", 
+    "Rent Growth Rate",
     "Interest Rate",
     "Vacancy Rate",
     "OpEx Growth Rate"
-]
+)
+
+# Sweep window per variable: (floor, ceiling, half-width around base)
+RANGE_SPECS = {
+    "Exit Cap Rate": (3.0, 9.0, 1.5),
+    "Rent Growth Rate": (0.0, 6.0, 2.0),
+    "Interest Rate": (2.0, 10.0, 2.0),
+    "Vacancy Rate": (0.0, 15.0, 3.0),
+    "OpEx Growth Rate": (0.0, 6.0, 2.0)
+}
+
+def make_range(name, center):
+    """7-point sweep range for one variable, clamped to its spec window"""
+    lo, hi, delta = RANGE_SPECS[name]
+    return np.linspace(max(lo, center - delta), min(hi, center + delta), 7)
+
+def sweep_metrics(metric_choice, year_1_noi, rent_gr, exit_cap, annual_ds,
+                  capex_annual, holding_period, equity_required,
+                  discount_rate, remaining_balance):
+    """
+    IRR / NPV / equity multiple over any broadcastable mix of scalar and
+    array parameters — Tab 1 passes axis-shaped grids, Tab 2 1-D ranges.
+    Growth factors and debt service keep their own (pre-broadcast)
+    shapes, so a swept axis costs its length in pow evaluations rather
+    than the full grid's. Returns the metric at the parameters' common
+    broadcast shape.
+    """
+    rent_gr = np.asarray(rent_gr, dtype=np.float64)
+    exit_cap = np.asarray(exit_cap, dtype=np.float64)
+    annual_ds = np.asarray(annual_ds, dtype=np.float64)
+    shape = np.broadcast_shapes(rent_gr.shape, exit_cap.shape, annual_ds.shape)
+
+    years = np.arange(1, holding_period + 1)
+    growth = (1 + rent_gr[..., None] / 100) ** (years - 1)
+    flows = np.empty(shape + (holding_period + 1,))
+    flows[..., 0] = -equity_required
+    flows[..., 1:] = year_1_noi * growth - capex_annual - annual_ds[..., None]
+    final_noi = year_1_noi * (1 + rent_gr / 100) ** holding_period
+    flows[..., -1] += final_noi / (exit_cap / 100) * 0.94 - remaining_balance
+
+    if "IRR" in metric_choice:
+        # NaN (no root found) stays NaN so those cells render blank
+        # instead of masquerading as a genuine 0% IRR
+        return irr_vec(flows.reshape(-1, holding_period + 1)).reshape(shape) * 100
+    if "NPV" in metric_choice:
+        # One matmul against a precomputed discount-factor vector
+        disc = (1.0 + discount_rate / 100) ** -np.arange(holding_period + 1)
+        return flows @ disc
+    return flows[..., 1:].sum(axis=-1) / equity_required
 
 # ==================== TAB 1: TWO-WAY SENSITIVITY ====================
 with tab1:
@@ -1976,13 +2213,13 @@ with tab1:
     with col1:
         var1 = st.selectbox(
             "Variable 1 (Y-Axis)",
-            sensitivity_vars,
+            SENSITIVITY_VARS,
             help="Variable shown on rows",
             key="two_var1"
         )
     
     with col2:
-        var2_options = [v for v in sensitivity_vars if v != var1]
+        var2_options = tuple(v for v in SENSITIVITY_VARS if v != var1)
         var2 = st.selectbox(
             "Variable 2 (X-Axis)",
             var2_options,
@@ -1997,83 +2234,99 @@ with tab1:
         key="two_metric"
     )
     
+    @st.cache_data(show_spinner=False, max_entries=32)
+    def _two_way_grid(var1, var2, metric_choice, year_1_noi, exit_cap_rate,
+                      rent_growth, interest_rate, vacancy, opex_growth,
+                      holding_period, amortization, io_period, loan_amount,
+                      equity_required, discount_rate, remaining_balance,
+                      capex_annual, base_ds):
+        """
+        The full 49-scenario sweep as one pure memoized function: reruns
+        with unchanged deal inputs (theme tweaks, save-name edits) return
+        the cached grid without recomputing a single cell
+        """
+        base_vals = {
+            "Exit Cap Rate": exit_cap_rate,
+            "Rent Growth Rate": rent_growth,
+            "Interest Rate": interest_rate,
+            "Vacancy Rate": vacancy,
+            "OpEx Growth Rate": opex_growth
+        }
+        var1_range = make_range(var1, base_vals[var1])
+        var2_range = make_range(var2, base_vals[var2])
+
+        # Axis-shaped parameters for the shared kernel: a swept variable
+        # contributes its 1-D range along its own grid axis, everything
+        # else stays scalar and broadcasts
+        def _axis_param(name, base):
+            if name == var1:
+                return var1_range[:, None]
+            if name == var2:
+                return var2_range[None, :]
+            return base
+
+        rent_arr = _axis_param("Rent Growth Rate", rent_growth)
+        exit_arr = _axis_param("Exit Cap Rate", exit_cap_rate)
+
+        # Debt service (simplified for speed): annuity payment evaluated
+        # once along the 1-D rate axis, base-rate cells pinned to the
+        # cached exact figure
+        if var1 == "Interest Rate" or var2 == "Interest Rate":
+            int_range = var1_range if var1 == "Interest Rate" else var2_range
+            if amortization > io_period:
+                monthly_rates = int_range / 100 / 12
+                remaining_payments = (amortization - io_period) * 12
+                pow_factor = (1 + monthly_rates) ** remaining_payments
+                ds_table = 12 * loan_amount * monthly_rates * pow_factor / (pow_factor - 1)
+            else:
+                ds_table = loan_amount * int_range / 100
+            ds_table = np.where(int_range == interest_rate, base_ds, ds_table)
+            ds_arr = ds_table[:, None] if var1 == "Interest Rate" else ds_table[None, :]
+        else:
+            ds_arr = base_ds
+
+        heat_results = sweep_metrics(
+            metric_choice, year_1_noi, rent_arr, exit_arr, ds_arr,
+            capex_annual, holding_period, equity_required, discount_rate,
+            remaining_balance)
+        # Axes the cell math doesn't react to come back collapsed;
+        # expand to the full grid for the heat map
+        heat_results = np.ascontiguousarray(np.broadcast_to(
+            heat_results, (len(var1_range), len(var2_range))))
+        return heat_results, var1_range, var2_range
+
+    show_cell_values = st.checkbox(
+        "Show cell values",
+        value=False,
+        help="Label every cell with its number (slower to render)",
+        key="heat_labels"
+    )
+
     if st.button("🔥 Generate Heat Map", use_container_width=True):
         with st.spinner("Calculating all scenarios..."):
-            
-            # Define ranges for each variable
-            var_ranges = {
-                "Exit Cap Rate": np.linspace(max(3.0, exit_cap_rate - 1.5), min(9.0, exit_cap_rate + 1.5), 7),
-                "Rent Growth Rate": np.linspace(max(0, rent_growth - 2.0), min(6.0, rent_growth + 2.0), 7),
-                "Interest Rate": np.linspace(max(2.0, interest_rate - 2.0), min(10.0, interest_rate + 2.0), 7),
-                "Vacancy Rate": np.linspace(max(0, vacancy - 3.0), min(15.0, vacancy + 3.0), 7),
-                "OpEx Growth Rate": np.linspace(max(0, opex_growth - 2.0), min(6.0, opex_growth + 2.0), 7)
-            }
-            
-            var1_range = var_ranges[var1]
-            var2_range = var_ranges[var2]
-            
-            # Create results matrix
-            heat_results = np.zeros((len(var1_range), len(var2_range)))
-            
-            # Precompute base values that don't change
-            monthly_rate = interest_rate / 100 / 12
-            
-            # Calculate for each combination (optimized)
-            for i, val1 in enumerate(var1_range):
-                for j, val2 in enumerate(var2_range):
-                    # Set up modified parameters
-                    test_rent_gr = rent_growth if var1 != "Rent Growth Rate" and var2 != "Rent Growth Rate" else (val1 if var1 == "Rent Growth Rate" else val2)
-                    test_vac = vacancy if var1 != "Vacancy Rate" and var2 != "Vacancy Rate" else (val1 if var1 == "Vacancy Rate" else val2)
-                    test_opex_gr = opex_growth if var1 != "OpEx Growth Rate" and var2 != "OpEx Growth Rate" else (val1 if var1 == "OpEx Growth Rate" else val2)
-                    test_exit = exit_cap_rate if var1 != "Exit Cap Rate" and var2 != "Exit Cap Rate" else (val1 if var1 == "Exit Cap Rate" else val2)
-                    test_int = interest_rate if var1 != "Interest Rate" and var2 != "Interest Rate" else (val1 if var1 == "Interest Rate" else val2)
-                    
-                    # Vectorized cash flow calculation
-                    years = np.arange(1, holding_period + 1)
-                    noi_values = year_1_noi * ((1 + test_rent_gr / 100) ** (years - 1))
-                    
-                    # Calculate CapEx for each year (doesn't change with tested variables)
-                    if property_type == "Single Family":
-                        capex_annual = capex_per_unit_or_sf
-                    elif property_type == "Multifamily":
-                        capex_annual = capex_per_unit_or_sf * units_or_sf
-                    else:
-                        capex_annual = capex_per_unit_or_sf * units_or_sf
-                    
-                    # Calculate debt service (simplified for speed)
-                    if test_int != interest_rate:
-                        test_monthly_rate = test_int / 100 / 12
-                        remaining_payments = (amortization - io_period) * 12
-                        temp_annual_ds = 12 * loan_amount * (test_monthly_rate * (1 + test_monthly_rate)**remaining_payments) / ((1 + test_monthly_rate)**remaining_payments - 1) if amortization > io_period else loan_amount * test_int / 100
-                    else:
-                        temp_annual_ds = calculate_debt_service(1, loan_amount, test_int, amortization, io_period)
-                    
-                    # Cash flows: NCF = NOI - CapEx, then BTCF = NCF - Debt Service
-                    ncf_values = noi_values - capex_annual
-                    temp_cf_list = ncf_values - temp_annual_ds
-                    
-                    # Sale calculation
-                    final_noi = year_1_noi * ((1 + test_rent_gr / 100) ** holding_period)
-                    temp_sale = final_noi / (test_exit / 100)
-                    temp_proceeds = temp_sale * 0.94 - remaining_balance
-                    
-                    # Calculate metric
-                    flows = np.concatenate([[-equity_required], temp_cf_list])
-                    flows[-1] += temp_proceeds
-                    
-                    try:
-                        if "IRR" in metric_choice:
-                            result = npf.irr(flows) * 100
-                        elif "NPV" in metric_choice:
-                            result = npf.npv(discount_rate / 100, flows)
-                        else:  # Equity Multiple
-                            result = (np.sum(temp_cf_list) + temp_proceeds) / equity_required
-                    except:
-                        result = 0
-                    
-                    heat_results[i, j] = result
-            
-            # Create heat map
+            # CapEx doesn't change with tested variables
+            if property_type == "Single Family":
+                capex_annual = capex_per_unit_or_sf
+            else:
+                capex_annual = capex_per_unit_or_sf * units_or_sf
+
+            heat_results, var1_range, var2_range = _two_way_grid(
+                var1, var2, metric_choice, year_1_noi, exit_cap_rate,
+                rent_growth, interest_rate, vacancy, opex_growth,
+                holding_period, amortization, io_period, loan_amount,
+                equity_required, discount_rate, sale.remaining_balance,
+                float(capex_annual),
+                calculate_debt_service(1, loan_amount, interest_rate, amortization, io_period))
+
+            # Create heat map; per-cell text nodes only when asked for —
+            # hover still shows the exact value either way
+            label_kwargs = {}
+            if show_cell_values:
+                label_kwargs = dict(
+                    text=np.round(heat_results, 1),
+                    texttemplate='%{text}',
+                    textfont={"size": 9}
+                )
             fig_heat = go.Figure(data=go.Heatmap(
                 z=heat_results,
                 x=[f"{v:.2f}" for v in var2_range],
@@ -2084,10 +2337,8 @@ with tab1:
                     [0.65, "#d9ef8b"],
                     [1, "#1a9850"]
                 ],
-                text=np.round(heat_results, 1),
-                texttemplate='%{text}',
-                textfont={"size": 9},
-                colorbar=dict(title=metric_choice.split("(")[0])
+                colorbar=dict(title=metric_choice.split("(")[0]),
+                **label_kwargs
             ))
             
             fig_heat.update_layout(
@@ -2102,9 +2353,10 @@ with tab1:
             
             # Key stats
             col1, col2, col3 = st.columns(3)
-            col1.metric("Best Case", f"{heat_results.max():.2f}")
+            # nan-aware: IRR cells with no root stay NaN rather than 0
+            col1.metric("Best Case", f"{np.nanmax(heat_results):.2f}")
             col2.metric("Your Base", f"{heat_results[len(var1_range)//2, len(var2_range)//2]:.2f}")
-            col3.metric("Worst Case", f"{heat_results.min():.2f}")
+            col3.metric("Worst Case", f"{np.nanmin(heat_results):.2f}")
             
             with st.expander("💡 How to Read This"):
                 st.markdown(f"""
@@ -2139,7 +2391,7 @@ with tab2:
     
     test_var = st.selectbox(
         "Select Variable to Test",
-        sensitivity_vars,
+        SENSITIVITY_VARS,
         help="Pick ONE variable to analyze",
         key="one_var"
     )
@@ -2150,77 +2402,74 @@ with tab2:
         key="one_metric"
     )
     
+    @st.cache_data(show_spinner=False, max_entries=32)
+    def _one_way_sweep(test_var, one_metric, year_1_noi, exit_cap_rate,
+                       rent_growth, interest_rate, vacancy, opex_growth,
+                       holding_period, amortization, io_period, loan_amount,
+                       equity_required, discount_rate, remaining_balance,
+                       capex_annual):
+        """
+        The 13-point sweep as a pure memoized function: repeat clicks
+        with unchanged deal inputs return the cached curve
+        """
+        # Define test range
+        if test_var == "Exit Cap Rate":
+            test_range = np.linspace(max(3.0, exit_cap_rate - 2.0), min(9.0, exit_cap_rate + 2.0), 13)
+            base_val = exit_cap_rate
+        elif test_var == "Rent Growth Rate":
+            test_range = np.linspace(max(0, rent_growth - 2.5), min(6.0, rent_growth + 2.5), 13)
+            base_val = rent_growth
+        elif test_var == "Interest Rate":
+            test_range = np.linspace(max(2.0, interest_rate - 2.5), min(10.0, interest_rate + 2.5), 13)
+            base_val = interest_rate
+        elif test_var == "Vacancy Rate":
+            test_range = np.linspace(max(0, vacancy - 4.0), min(15.0, vacancy + 4.0), 13)
+            base_val = vacancy
+        else:  # OpEx Growth
+            test_range = np.linspace(max(0, opex_growth - 2.5), min(6.0, opex_growth + 2.5), 13)
+            base_val = opex_growth
+
+        # Parameters for the shared kernel: the swept variable becomes
+        # the test axis, everything else stays scalar and broadcasts
+        rent_arr = test_range if test_var == "Rent Growth Rate" else rent_growth
+        exit_arr = test_range if test_var == "Exit Cap Rate" else exit_cap_rate
+        if test_var == "Interest Rate":
+            # Year-1 debt service over the whole rate axis at once,
+            # mirroring calculate_debt_service's branches
+            if io_period >= 1 or loan_amount == 0:
+                ds_arr = loan_amount * test_range / 100
+            else:
+                mr = test_range / 100 / 12
+                rp = (amortization - io_period) * 12
+                if rp > 0:
+                    ds_arr = 12 * loan_amount * (mr * (1 + mr) ** rp) / ((1 + mr) ** rp - 1)
+                else:
+                    ds_arr = np.zeros_like(test_range)
+        else:
+            ds_arr = calculate_debt_service(1, loan_amount, interest_rate, amortization, io_period)
+
+        one_results = sweep_metrics(
+            one_metric, year_1_noi, rent_arr, exit_arr, ds_arr,
+            capex_annual, holding_period, equity_required, discount_rate,
+            remaining_balance)
+        # Sweeps the cell math ignores collapse to a scalar; expand so
+        # the chart still gets its (flat) 13-point line
+        one_results = np.ascontiguousarray(np.broadcast_to(one_results, test_range.shape))
+        return test_range, base_val, one_results
+
     if st.button("📈 Run Analysis", use_container_width=True):
         with st.spinner("Analyzing..."):
-            
-            # Define test range
-            if test_var == "Exit Cap Rate":
-                test_range = np.linspace(max(3.0, exit_cap_rate - 2.0), min(9.0, exit_cap_rate + 2.0), 13)
-                base_val = exit_cap_rate
-            elif test_var == "Rent Growth Rate":
-                test_range = np.linspace(max(0, rent_growth - 2.5), min(6.0, rent_growth + 2.5), 13)
-                base_val = rent_growth
-            elif test_var == "Interest Rate":
-                test_range = np.linspace(max(2.0, interest_rate - 2.5), min(10.0, interest_rate + 2.5), 13)
-                base_val = interest_rate
-            elif test_var == "Vacancy Rate":
-                test_range = np.linspace(max(0, vacancy - 4.0), min(15.0, vacancy + 4.0), 13)
-                base_val = vacancy
-            else:  # OpEx Growth
-                test_range = np.linspace(max(0, opex_growth - 2.5), min(6.0, opex_growth + 2.5), 13)
-                base_val = opex_growth
-            
-            one_results = []
-            
-            for test_val in test_range:
-                # Quick calculation with modified variable
-                temp_noi = year_1_noi
-                temp_cf_list = []
-                
-                test_rent_gr = rent_growth if test_var != "Rent Growth Rate" else test_val
-                test_vac = vacancy if test_var != "Vacancy Rate" else test_val
-                test_opex_gr = opex_growth if test_var != "OpEx Growth Rate" else test_val
-                test_exit = exit_cap_rate if test_var != "Exit Cap Rate" else test_val
-                test_int = interest_rate if test_var != "Interest Rate" else test_val
-                
-                # Vectorized NOI calculation
-                years = np.arange(1, holding_period + 1)
-                noi_values = year_1_noi * ((1 + test_rent_gr / 100) ** (years - 1))
-                
-                # Calculate CapEx
-                if property_type == "Single Family":
-                    capex_annual = capex_per_unit_or_sf
-                elif property_type == "Multifamily":
-                    capex_annual = capex_per_unit_or_sf * units_or_sf
-                else:
-                    capex_annual = capex_per_unit_or_sf * units_or_sf
-                
-                # Calculate debt service once
-                temp_annual_ds = calculate_debt_service(1, loan_amount, test_int, amortization, io_period)
-                
-                # Cash flows: NCF = NOI - CapEx, then BTCF = NCF - Debt Service
-                ncf_values = noi_values - capex_annual
-                temp_cf_list = ncf_values - temp_annual_ds
-                
-                final_noi = year_1_noi * ((1 + test_rent_gr / 100) ** holding_period)
-                temp_sale = final_noi / (test_exit / 100)
-                temp_proceeds = temp_sale * 0.94 - remaining_balance
-                
-                flows = np.concatenate([[-equity_required], temp_cf_list])
-                flows[-1] += temp_proceeds
-                
-                try:
-                    if "IRR" in one_metric:
-                        result = npf.irr(flows) * 100
-                    elif "NPV" in one_metric:
-                        result = npf.npv(discount_rate / 100, flows)
-                    else:
-                        result = (np.sum(temp_cf_list) + temp_proceeds) / equity_required
-                except:
-                    result = 0
-                
-                one_results.append(result)
-            
+            if property_type == "Single Family":
+                capex_annual = capex_per_unit_or_sf
+            else:
+                capex_annual = capex_per_unit_or_sf * units_or_sf
+
+            test_range, base_val, one_results = _one_way_sweep(
+                test_var, one_metric, year_1_noi, exit_cap_rate, rent_growth,
+                interest_rate, vacancy, opex_growth, holding_period,
+                amortization, io_period, loan_amount, equity_required,
+                discount_rate, sale.remaining_balance, float(capex_annual))
+
             # Create line chart
             fig_line = go.Figure()
             fig_line.add_trace(go.Scatter(
@@ -2244,11 +2493,15 @@ with tab2:
             save_chart_to_session(f"One-Way Sensitivity: {test_var}", fig_line)
             
             # Stats
-            base_idx = np.argmin(np.abs(test_range - base_val))
+            # test_range is a linspace, so the nearest index to the base
+            # value is closed-form — no temp array or argmin pass
+            span = test_range[-1] - test_range[0]
+            base_idx = int(round((base_val - test_range[0]) / span * (test_range.size - 1))) if span else 0
+            base_idx = max(0, min(test_range.size - 1, base_idx))
             col1, col2, col3 = st.columns(3)
             col1.metric("Base Case", f"{one_results[base_idx]:.2f}")
-            col2.metric("Best Case", f"{max(one_results):.2f}")
-            col3.metric("Worst Case", f"{min(one_results):.2f}")
+            col2.metric("Best Case", f"{np.nanmax(one_results):.2f}")
+            col3.metric("Worst Case", f"{np.nanmin(one_results):.2f}")
             
             # Calculate sensitivity
             slope = (one_results[-1] - one_results[0]) / (test_range[-1] - test_range[0])
@@ -2286,80 +2539,72 @@ with tab3:
         key="tornado_metric"
     )
     
+    @st.cache_data(show_spinner=False, max_entries=32)
+    def _tornado_rows(year_1_noi, rent_growth, exit_cap_rate, interest_rate,
+                      vacancy, opex_growth, holding_period, equity_required):
+        """
+        ±20% impact rows for every sensitivity variable, sorted widest
+        first; memoized so repeat clicks on an unchanged deal are free
+        """
+        tornado_data = []
+
+        # Test each variable at ±20%
+        for var_name in SENSITIVITY_VARS:
+            if var_name == "Exit Cap Rate": base_val = exit_cap_rate
+            elif var_name == "Rent Growth Rate": base_val = rent_growth
+            elif var_name == "Interest Rate": base_val = interest_rate
+            elif var_name == "Vacancy Rate": base_val = vacancy
+            else: base_val = opex_growth
+
+            test_vals = np.array([base_val * 0.8, base_val * 1.2])
+            rent_grs = test_vals if var_name == "Rent Growth Rate" else np.full(2, rent_growth)
+            exit_caps = test_vals if var_name == "Exit Cap Rate" else np.full(2, exit_cap_rate)
+
+            # Quick calc: closed-form terminal NOI for both the low
+            # and high case at once, no year-by-year compounding loop
+            temp_noi = year_1_noi * (1 + rent_grs / 100) ** holding_period
+            temp_sale = temp_noi / (exit_caps / 100)
+            var_results = (temp_sale * 0.94 - equity_required) / equity_required * 100
+
+            tornado_data.append({
+                "variable": var_name,
+                "low": var_results[0],
+                "high": var_results[1],
+                "range": abs(var_results[1] - var_results[0])
+            })
+
+        # Sort by range
+        tornado_data.sort(key=lambda x: x["range"], reverse=True)
+        return tornado_data
+
     if st.button("🌪️ Generate Tornado Chart", use_container_width=True):
         with st.spinner("Testing all variables..."):
-            
-            tornado_data = []
-            
-            # Test each variable at ±20%
-            for var_name in sensitivity_vars:
-                if var_name == "Exit Cap Rate": base_val = exit_cap_rate
-                elif var_name == "Rent Growth Rate": base_val = rent_growth
-                elif var_name == "Interest Rate": base_val = interest_rate
-                elif var_name == "Vacancy Rate": base_val = vacancy
-                else: base_val = opex_growth
-                
-                low_val = base_val * 0.8
-                high_val = base_val * 1.2
-                
-                var_results = []
-                
-                for test_val in [low_val, high_val]:
-                    # Quick calc
-                    temp_noi = year_1_noi
-                    
-                    test_params = {
-                        "rent_gr": rent_growth,
-                        "vac": vacancy,
-                        "opex_gr": opex_growth,
-                        "exit_cap": exit_cap_rate
-                    }
-                    
-                    if var_name == "Rent Growth Rate": test_params["rent_gr"] = test_val
-                    elif var_name == "Vacancy Rate": test_params["vac"] = test_val
-                    elif var_name == "OpEx Growth Rate": test_params["opex_gr"] = test_val
-                    elif var_name == "Exit Cap Rate": test_params["exit_cap"] = test_val
-                    
-                    for yr in range(holding_period):
-                        temp_noi *= (1 + test_params["rent_gr"] / 100)
-                    
-                    temp_sale = temp_noi / (test_params["exit_cap"] / 100)
-                    simple_return = (temp_sale * 0.94 - equity_required) / equity_required
-                    
-                    var_results.append(simple_return * 100)
-                
-                tornado_data.append({
-                    "variable": var_name,
-                    "low": var_results[0],
-                    "high": var_results[1],
-                    "range": abs(var_results[1] - var_results[0])
-                })
-            
-            # Sort by range
-            tornado_data.sort(key=lambda x: x["range"], reverse=True)
-            
+            tornado_data = _tornado_rows(
+                year_1_noi, rent_growth, exit_cap_rate, interest_rate,
+                vacancy, opex_growth, holding_period, equity_required)
+
             # Create chart
             fig_tornado = go.Figure()
             
-            for item in tornado_data:
-                # Low bar
-                fig_tornado.add_trace(go.Bar(
-                    y=[item["variable"]],
-                    x=[item["low"]],
-                    orientation='h',
-                    marker=dict(color='#d73027'),
-                    name='Pessimistic',
-                    showlegend=False
-                ))
-                # High bar
-                fig_tornado.add_trace(go.Bar(
-                    y=[item["variable"]],
-                    x=[item["high"]],
-                    orientation='h',
-                    marker=dict(color='#1a9850'),
-                    name='Optimistic',
-                    showlegend=False
-                ))
+            # Two traces total (all lows, all highs) instead of two per
+            # variable: less figure-build time and a smaller payload
+            tornado_vars = [item["variable"] for item in tornado_data]
+            fig_tornado.add_trace(go.Bar(
+                y=tornado_vars,
+                x=[item["low"] for item in tornado_data],
+                orientation='h',
+                marker=dict(color='#d73027'),
+                name='Pessimistic',
+                showlegend=False
+            ))
+            fig_tornado.add_trace(go.Bar(
+                y=tornado_vars,
+                x=[item["high"] for item in tornado_data],
+                orientation='h',
+                marker=dict(color='#1a9850'),
+                name='Optimistic',
+                showlegend=False
+            ))
             
             fig_tornado.update_layout(
                 title='Variable Impact on Returns (±20% Test)',
@@ -2425,71 +2670,78 @@ else:
         selected_deals.append(all_deals_for_comparison[deal3_name])
         selected_names.append(deal3_name)
     
+    @st.cache_data(show_spinner=False, max_entries=8)
+    def _comparison_table(selected_names, selected_deals):
+        """
+        Side-by-side table and scores for a deal set, built (and all the
+        per-cell currency formatting paid) once per selection
+        """
+        comparison_data = {
+            'Metric': [
+                'Property Type',
+                'Purchase Price',
+                'Equity Required',
+                'Levered IRR (%)',
+                'Equity Multiple (x)',
+                'NPV ($)',
+                'Going-In Cap (%)',
+                'Exit Cap (%)',
+                'Holding Period (yrs)',
+                'LTV (%)'
+            ]
+        }
+
+        # Calculate scores for each deal
+        deal_scores = []
+
+        for deal_name, deal_data in zip(selected_names, selected_deals):
+            # Prepare metrics for scoring
+            equity_calc = deal_data.get('purchase_price', 0) - (deal_data.get('purchase_price', 0) * (deal_data.get('loan_to_value', 0) / 100))
+
+            deal_metrics = {
+                'irr': deal_data.get('irr', 0),
+                'equity_multiple': deal_data.get('equity_multiple', 1),
+                'npv': deal_data.get('npv', 0),
+                'cap_rate': deal_data.get('going_in_cap', 0),
+                'year1_coc': deal_data.get('irr', 0) / 2,
+                'avg_coc': deal_data.get('irr', 0) / 1.5,
+                'dscr': 1.3
+            }
+
+            deal_property_data = {
+                'property_type': deal_data.get('property_type', 'Unknown'),
+                'equity_required': equity_calc,
+                'exit_cap_rate': deal_data.get('exit_cap_rate', 0),
+                'loan_to_value': deal_data.get('loan_to_value', 0),
+                'holding_period': deal_data.get('holding_period', 10)
+            }
+
+            score, breakdown, grade, rating = calculate_deal_score(deal_metrics, deal_property_data)
+            deal_scores.append({'score': score, 'grade': grade, 'rating': rating})
+
+            # Add column for this deal
+            comparison_data[deal_name] = [
+                deal_data.get('property_type', 'N/A'),
+                f"${deal_data.get('purchase_price', 0):,.0f}",
+                f"${equity_calc:,.0f}",
+                f"{deal_data.get('irr', 0):.2f}%",
+                f"{deal_data.get('equity_multiple', 0):.2f}x",
+                f"${deal_data.get('npv', 0):,.0f}",
+                f"{deal_data.get('going_in_cap', 0):.2f}%",
+                f"{deal_data.get('exit_cap_rate', 0):.2f}%",
+                deal_data.get('holding_period', 'N/A'),
+                f"{deal_data.get('loan_to_value', 0):.1f}%"
+            ]
+
+        return pd.DataFrame(comparison_data), deal_scores
+
     if len(selected_deals) >= 2:
         if st.button("🔍 Compare Selected Deals", use_container_width=True, type="primary"):
             st.markdown("---")
             st.subheader("📊 Comparison Results")
-            
-            # Create comparison table
-            comparison_data = {
-                'Metric': [
-                    'Property Type',
-                    'Purchase Price',
-                    'Equity Required',
-                    'Levered IRR (%)',
-                    'Equity Multiple (x)',
-                    'NPV ($)',
-                    'Going-In Cap (%)',
-                    'Exit Cap (%)',
-                    'Holding Period (yrs)',
-                    'LTV (%)'
-                ]
-            }
-            
-            # Calculate scores for each deal
-            deal_scores = []
-            
-            for deal_name, deal_data in zip(selected_names, selected_deals):
-                # Prepare metrics for scoring
-                equity_calc = deal_data.get('purchase_price', 0) - (deal_data.get('purchase_price', 0) * (deal_data.get('loan_to_value', 0) / 100))
-                
-                deal_metrics = {
-                    'irr': deal_data.get('irr', 0),
-                    'equity_multiple': deal_data.get('equity_multiple', 1),
-                    'npv': deal_data.get('npv', 0),
-                    'cap_rate': deal_data.get('going_in_cap', 0),
-                    'year1_coc': deal_data.get('irr', 0) / 2,
-                    'avg_coc': deal_data.get('irr', 0) / 1.5,
-                    'dscr': 1.3
-                }
-                
-                deal_property_data = {
-                    'property_type': deal_data.get('property_type', 'Unknown'),
-                    'equity_required': equity_calc,
-                    'exit_cap_rate': deal_data.get('exit_cap_rate', 0),
-                    'loan_to_value': deal_data.get('loan_to_value', 0),
-                    'holding_period': deal_data.get('holding_period', 10)
-                }
-                
-                score, breakdown, grade, rating = calculate_deal_score(deal_metrics, deal_property_data)
-                deal_scores.append({'score': score, 'grade': grade, 'rating': rating})
-                
-                # Add column for this deal
-                comparison_data[deal_name] = [
-                    deal_data.get('property_type', 'N/A'),
-                    f"${deal_data.get('purchase_price', 0):,.0f}",
-                    f"${equity_calc:,.0f}",
-                    f"{deal_data.get('irr', 0):.2f}%",
-                    f"{deal_data.get('equity_multiple', 0):.2f}x",
-                    f"${deal_data.get('npv', 0):,.0f}",
-                    f"{deal_data.get('going_in_cap', 0):.2f}%",
-                    f"{deal_data.get('exit_cap_rate', 0):.2f}%",
-                    deal_data.get('holding_period', 'N/A'),
-                    f"{deal_data.get('loan_to_value', 0):.1f}%"
-                ]
-            
+
             # Display comparison table
-            comparison_df = pd.DataFrame(comparison_data)
+            comparison_df, deal_scores = _comparison_table(selected_names, selected_deals)
             st.dataframe(comparison_df, use_container_width=True, height=420)
             
             st.markdown("---")
@@ -2549,28 +2801,27 @@ else:
             # Risk vs Return Scatter
             fig_risk_return = go.Figure()
             
-            for idx, (deal_name, deal_data) in enumerate(zip(selected_names, selected_deals)):
-                is_best = idx == best_idx
-                fig_risk_return.add_trace(go.Scatter(
-                    x=[deal_data.get('loan_to_value', 0)],
-                    y=[deal_data.get('irr', 0)],
-                    mode='markers+text',
-                    name=deal_name,
-                    marker=dict(
-                        size=20,
-                        color='#10b981' if is_best else '#6b7280',
-                        symbol='star' if is_best else 'circle'
-                    ),
-                    text=[deal_name],
-                    textposition='top center'
-                ))
-            
+            # One trace for all deals: marker color/symbol arrays flag the
+            # winner, text labels replace per-deal legend entries
+            fig_risk_return.add_trace(go.Scatter(
+                x=[deal_data.get('loan_to_value', 0) for deal_data in selected_deals],
+                y=[deal_data.get('irr', 0) for deal_data in selected_deals],
+                mode='markers+text',
+                marker=dict(
+                    size=20,
+                    color=['#10b981' if idx == best_idx else '#6b7280' for idx in range(len(selected_deals))],
+                    symbol=['star' if idx == best_idx else 'circle' for idx in range(len(selected_deals))]
+                ),
+                text=selected_names,
+                textposition='top center',
+                showlegend=False
+            ))
+
             fig_risk_return.update_layout(
                 title="Risk vs Return Analysis",
                 xaxis_title="Leverage (LTV %)",
                 yaxis_title="IRR (%)",
-                height=400,
-                showlegend=True
+                height=400
             )
             
             st.plotly_chart(fig_risk_return, use_container_width=True)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Fast financial kernels for the CRE DCF Valuation Model.
+
+Batched NumPy replacements for the per-scenario numpy_financial root
+solves: one vectorized iteration advances every scenario at once.
+"""
+
+import numpy as np
+
+
+# Bracket-scan grid for the bisection fallback: dense around typical
+# deal IRRs, sparser toward the (-1, 1000] extremes
+_IRR_GRID = np.concatenate((
+    np.array([-0.9999, -0.999, -0.99, -0.95]),
+    np.linspace(-0.9, 1.5, 49),
+    np.array([2.0, 3.0, 5.0, 7.0, 10.0, 20.0, 50.0, 100.0, 1000.0])
+))
+
+
+def _bisect_irr(cf, periods, rows, tol):
+    """
+    Bisection rescue for rows Newton failed on. Scans _IRR_GRID for
+    sign changes of NPV, bisects every bracket found, and keeps the
+    root nearest rate 0 (matching numpy_financial.irr's root choice
+    when several exist). Returns an array aligned with rows; NaN where
+    no bracket exists.
+    """
+    sub = cf[rows]
+    m = rows.size
+    idx = np.arange(m)
+    f_grid = (sub[:, None, :] * (1.0 + _IRR_GRID)[None, :, None] ** -periods).sum(axis=2)
+    remaining = f_grid[:, :-1] * f_grid[:, 1:] <= 0.0
+
+    best = np.full(m, np.nan)
+    while remaining.any():
+        # First still-unvisited bracket of each row this pass
+        pick = np.argmax(remaining, axis=1)
+        active = remaining[idx, pick]
+        remaining[idx, pick] = False
+
+        lo = _IRR_GRID[pick]
+        hi = _IRR_GRID[pick + 1]
+        flo = f_grid[idx, pick]
+        while np.any(hi - lo > tol):
+            mid = 0.5 * (lo + hi)
+            fmid = (sub * (1.0 + mid)[:, None] ** -periods).sum(axis=1)
+            go_lo = flo * fmid <= 0.0
+            hi = np.where(go_lo, mid, hi)
+            lo = np.where(go_lo, lo, mid)
+            flo = np.where(go_lo, flo, fmid)
+        root = 0.5 * (lo + hi)
+        better = active & (np.isnan(best) | (np.abs(root) < np.abs(best)))
+        best = np.where(better, root, best)
+    return best
+
+
+def irr_vec(cashflows, guess=0.1, iters=50, tol=1e-7):
+    """
+    Batched IRR over the rows of an (N, T) cash-flow matrix: vectorized
+    Newton-Raphson first (one iteration advances all N scenarios at
+    once), then a bracketed-bisection rescue for any row where Newton
+    stalls or lands off the root — matching numpy_financial.irr's
+    answers without its per-row Python cost.
+    Returns an (N,) array of rates (NOT percent); NaN where no root.
+    """
+    cf = np.atleast_2d(np.asarray(cashflows, dtype=np.float64))
+    n, t = cf.shape
+    periods = np.arange(t, dtype=np.float64)
+    # Rows without a sign change have no root: settle them as NaN up
+    # front so Newton only iterates (and terminates) on solvable rows
+    solvable = (cf > 0.0).any(axis=1) & (cf < 0.0).any(axis=1)
+    r = np.where(solvable, guess, np.nan)
+    converged = ~solvable
+    if converged.all():
+        return r
+
+    for _ in range(iters):
+        base = 1.0 + r
+        disc = base[:, None] ** -periods
+        f = (cf * disc).sum(axis=1)
+        fp = -(periods * cf * disc).sum(axis=1) / base
+        step = f / np.where(fp == 0, np.nan, fp)
+        step = np.where(converged, 0.0, step)
+        r = np.clip(r - step, -0.99, 10.0)
+        converged |= np.abs(step) < tol
+        if converged.all():
+            break
+    r = np.where(converged, r, np.nan)
+
+    # A tiny step can also mean Newton pinned against the clip bounds or
+    # stalled on a flat stretch: accept its answer only when the NPV
+    # residual is actually small, and send the rest to bisection
+    check = np.flatnonzero(solvable & np.isfinite(r))
+    if check.size:
+        resid = (cf[check] * (1.0 + r[check])[:, None] ** -periods).sum(axis=1)
+        bad = np.abs(resid) > 1e-4 * np.abs(cf[check]).sum(axis=1)
+        r[check[bad]] = np.nan
+
+    # Flows with several sign changes can have several genuine roots and
+    # Newton keeps whichever basin the guess fell in; re-solve those via
+    # the grid scan so the root nearest zero wins, matching
+    # numpy_financial.irr's selection
+    sgn = np.sign(cf)
+    for j in range(1, t):
+        sgn[:, j] = np.where(sgn[:, j] == 0.0, sgn[:, j - 1], sgn[:, j])
+    multiroot = (sgn[:, :-1] * sgn[:, 1:] < 0.0).sum(axis=1) > 1
+
+    retry = np.flatnonzero(solvable & (~np.isfinite(r) | multiroot))
+    if retry.size:
+        r[retry] = _bisect_irr(cf, periods, retry, tol)
+    return r
+
+
+def npv_vec(rates, cashflows):
+    """
+    NPV of (N, T) cash-flow rows at one rate (or a matching rate vector).
+    Period 0 is undiscounted, matching numpy_financial.npv.
+    Returns an (N,) array.
+    """
+    cf = np.atleast_2d(np.asarray(cashflows, dtype=np.float64))
+    r = np.atleast_1d(np.asarray(rates, dtype=np.float64))
+    disc = (1.0 + r)[:, None] ** -np.arange(cf.shape[1], dtype=np.float64)
+    return (cf * disc).sum(axis=1)